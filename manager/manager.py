@@ -5,20 +5,27 @@ Manages multiple TGCrossChat instances through Telegram bot interface
 """
 
 import os
-import json
-import hashlib
 import subprocess
 import shutil
+import tempfile
 import logging
 import asyncio
 import time
+import threading
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from io import BytesIO
 
+import docker
+import requests
+import orjson
+import xxhash
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, ConversationHandler, ContextTypes, filters
 from telegram.constants import ParseMode
+from telegram.request import HTTPXRequest
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -28,6 +35,13 @@ import undetected_chromedriver as uc
 
 import config
 
+# Use uvloop's faster event loop when it is available (not on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Enable logging
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -41,51 +55,283 @@ WAITING_DISCORD_TOKEN, WAITING_TELEGRAM_TOKEN, WAITING_TOPICS_CHANNEL = range(3)
 # Data file path
 DATA_FILE = Path("data.json")
 INSTANCES_DIR = Path("instances")
+REPO_URL = "https://github.com/zlc1004/tgcrosschat.git"
+
+# How long a probed container status is reused (seconds)
+STATUS_CACHE_TTL = 3.0
+# Room left under Telegram's 4096 character message limit for the details view
+DETAILS_MESSAGE_LIMIT = 3950
+
+# Errors from the Docker SDK; a daemon that goes away after connecting surfaces as a requests error
+DOCKER_ERRORS = (docker.errors.DockerException, requests.exceptions.RequestException)
+
+# Emoji for stored instance statuses and for docker container states
+STATUS_EMOJI = {"running": "🟢", "stopped": "🔴"}
+CONTAINER_STATE_EMOJI = {"running": "🟢", "exited": "🔴"}
+
+# ISO timestamp "2024-01-01T12:00:00" -> "2024-01-01 12:00:00"
+TIMESTAMP_TRANS = str.maketrans("T", " ")
+
+def is_create_instance_data(data) -> bool:
+    """Callback data that enters the instance creation conversation"""
+    return data == "create_instance"
+
+def is_valid_channel_id(value: str) -> bool:
+    """Check that a channel ID is an optionally negative integer"""
+    digits = value[1:] if value[:1] == '-' else value
+    return digits.isdecimal()
+
+def format_size(num: float, base: int = 1000) -> str:
+    """Format a byte count the way the docker CLI does (kB/MB or KiB/MiB)"""
+    units = ["B", "kB", "MB", "GB", "TB"] if base == 1000 else ["B", "KiB", "MiB", "GiB", "TiB"]
+    for unit in units[:-1]:
+        if abs(num) < base:
+            return f"{num:.4g}{unit}"
+        num /= base
+    return f"{num:.4g}{units[-1]}"
+
+def format_container_stats(stats: dict) -> dict:
+    """Turn a raw Docker stats sample into the fields `docker stats` shows"""
+    cpu = stats["cpu_stats"]
+    precpu = stats.get("precpu_stats", {})
+    cpu_delta = cpu["cpu_usage"]["total_usage"] - precpu.get("cpu_usage", {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or len(cpu["cpu_usage"].get("percpu_usage") or []) or 1
+    cpu_percent = cpu_delta / system_delta * online_cpus * 100 if system_delta > 0 and cpu_delta > 0 else 0.0
+
+    memory = stats["memory_stats"]
+    memory_stats = memory.get("stats", {})
+    # Page cache is not counted, same as the docker CLI (cgroup v2 / v1 keys)
+    cache = memory_stats.get("inactive_file", memory_stats.get("total_inactive_file", 0))
+    memory_used = memory.get("usage", 0) - cache
+
+    networks = stats.get("networks") or {}
+    rx_bytes = sum(net.get("rx_bytes", 0) for net in networks.values())
+    tx_bytes = sum(net.get("tx_bytes", 0) for net in networks.values())
+
+    block_read = block_write = 0
+    for entry in (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            block_read += entry.get("value", 0)
+        elif op == "write":
+            block_write += entry.get("value", 0)
+
+    return {
+        "cpu_usage": f"{cpu_percent:.2f}%",
+        "memory_usage": f"{format_size(memory_used, 1024)} / {format_size(memory.get('limit', 0), 1024)}",
+        "network_io": f"{format_size(rx_bytes)} / {format_size(tx_bytes)}",
+        "block_io": f"{format_size(block_read)} / {format_size(block_write)}"
+    }
 
 class InstanceManager:
     def __init__(self):
         self.data_file = DATA_FILE
         self.instances_dir = INSTANCES_DIR
+        self.template_dir = INSTANCES_DIR / ".template"
+        self._template_lock = asyncio.Lock()
 
         # Ensure instances directory exists
         self.instances_dir.mkdir(exist_ok=True)
 
         # Load existing data
         self.instances = self.load_data()
+        self._dirty = False
+        for instance in self.instances:
+            # Older data files predate the stored short ID
+            instance.setdefault("short_id", instance["docker_stack_name"][:8])
+
+        # Lookup indexes kept in sync with self.instances
+        self._by_stack: Dict[str, Dict] = {i["docker_stack_name"]: i for i in self.instances}
+        # Several instances can share a chat id, so each chat maps to its instances in list order
+        self._by_chat: Dict[str, List[Dict]] = {}
+        for instance in self.instances:
+            self._by_chat.setdefault(instance["chatid"], []).append(instance)
+
+        # docker_stack_name -> current stage of an in-flight create_instance call
+        self._create_phase: Dict[str, str] = {}
+
+        # docker_stack_name -> (probe time, status)
+        self._status_cache: Dict[str, Tuple[float, str]] = {}
+
+        # Snapshot returned by list_instances(), dropped on every list change
+        self._cache: Optional[List[Dict]] = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+        # Docker SDK client, connected on first use
+        self._docker_client: Optional[docker.DockerClient] = None
+        self._docker_lock = threading.Lock()
+
+        # Background directory deletions, referenced until they finish
+        self._cleanup_tasks: set = set()
+
+    @property
+    def docker_client(self) -> docker.DockerClient:
+        """Long-lived Docker SDK client; connecting blocks, so only use it from worker threads"""
+        with self._docker_lock:
+            if self._docker_client is None:
+                self._docker_client = docker.from_env()
+            return self._docker_client
+
+    def _list_containers(self, project: Optional[str] = None) -> list:
+        """List compose-managed containers, optionally for a single project"""
+        label = "com.docker.compose.project"
+        if project:
+            label = f"{label}={project}"
+        return self.docker_client.containers.list(all=True, filters={"label": label})
+
+    def _inspect_container(self, container_id: str) -> dict:
+        """Inspect a container (blocking; run in a worker thread)"""
+        return self.docker_client.api.inspect_container(container_id)
+
+    def _container_stats(self, container_id: str) -> dict:
+        """One-shot resource stats for a container (blocking; run in a worker thread)"""
+        return self.docker_client.api.stats(container_id, stream=False)
+
+    async def _run(self, cmd: List[str], cwd: Optional[Path] = None, check: bool = False) -> subprocess.CompletedProcess:
+        """Run a command without blocking the event loop"""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+
+        result = subprocess.CompletedProcess(cmd, proc.returncode, stdout.decode(), stderr.decode())
+        if check:
+            result.check_returncode()
+        return result
 
     def load_data(self) -> List[Dict]:
         """Load instances data from JSON file"""
         if self.data_file.exists():
             try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
+                return orjson.loads(self.data_file.read_bytes())
+            except (orjson.JSONDecodeError, IOError) as e:
                 logger.error(f"Error loading data file: {e}")
                 return []
         return []
 
+    def mark_dirty(self):
+        """Flag in-memory instance data as changed since the last save"""
+        self._dirty = True
+
     def save_data(self):
-        """Save instances data to JSON file"""
-        try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.instances, f, indent=2)
-        except IOError as e:
-            logger.error(f"Error saving data file: {e}")
+        """Save instances data to JSON file if anything changed"""
+        # Blocking (fsync); async callers run it via asyncio.to_thread. Saves from several
+        # threads are serialized so an older snapshot can never replace a newer one
+        with self._save_lock:
+            if not self._dirty:
+                return
+
+            with self._lock:
+                data = orjson.dumps(self.instances, option=orjson.OPT_INDENT_2)
+                self._dirty = False
+
+            tmp_path = None
+            try:
+                # Write to a temp file and swap it in so a crash never leaves a torn file
+                with tempfile.NamedTemporaryFile(
+                    dir=self.data_file.parent, prefix=f".{self.data_file.name}.", delete=False
+                ) as tmp_file:
+                    tmp_path = tmp_file.name
+                    tmp_file.write(data)
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
+                os.replace(tmp_path, self.data_file)
+            except IOError as e:
+                self._dirty = True
+                logger.error(f"Error saving data file: {e}")
+                if tmp_path:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
 
     def generate_instance_hash(self, chat_id: str, discord_token: str, telegram_token: str) -> str:
-        """Generate SHA256 hash for instance identification"""
+        """Generate xxh128 hash for instance identification (not a security boundary)"""
         combined = f"{chat_id}{discord_token}{telegram_token}"
-        return hashlib.sha256(combined.encode()).hexdigest()
+        return xxhash.xxh128_hexdigest(combined.encode())
 
     def get_instance_by_chat_id(self, chat_id: str) -> Optional[Dict]:
-        """Get instance by chat ID"""
-        for instance in self.instances:
-            if instance["chatid"] == chat_id:
-                return instance
-        return None
+        """Get the first instance for a chat ID"""
+        matches = self._by_chat.get(chat_id)
+        return matches[0] if matches else None
+
+    def get_create_phase(self, docker_stack_name: str) -> Optional[str]:
+        """Get the current stage of an in-flight instance creation"""
+        return self._create_phase.get(docker_stack_name)
+
+    def _set_status(self, docker_stack_name: str, status: str):
+        """Update the stored status of an instance"""
+        self._status_cache.pop(docker_stack_name, None)
+        instance = self._by_stack.get(docker_stack_name)
+        if instance and instance.get("status") != status:
+            instance["status"] = status
+            self._dirty = True
+
+    async def _ensure_template(self):
+        """Clone the repository template, or bring it up to date; caller holds _template_lock"""
+        if (self.template_dir / ".git").exists():
+            # Fetch the newest commit so every create/recreate starts from current code.
+            # git replaces changed files (new inodes) instead of editing them, so
+            # instances hardlinked to older versions keep their own copies.
+            try:
+                await self._run([
+                    "git", "fetch", "--depth=1", "origin"
+                ], cwd=self.template_dir, check=True)
+                await self._run([
+                    "git", "reset", "--hard", "FETCH_HEAD"
+                ], cwd=self.template_dir, check=True)
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Failed to refresh repository template, using existing copy: {e.stderr}")
+            return
+
+        if self.template_dir.exists():
+            shutil.rmtree(self.template_dir)
+
+        logger.info(f"Cloning repository template to {self.template_dir}")
+        try:
+            await self._run([
+                "git", "clone", "--depth=1", "--single-branch",
+                REPO_URL,
+                str(self.template_dir)
+            ], check=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Git clone failed: {e}")
+            raise Exception(f"Failed to clone repository: {e.stderr}")
 
-    def create_instance(self, chat_id: str, discord_token: str, telegram_token: str, topics_channel_id: str) -> Dict:
+    async def _copy_template(self, instance_path: Path):
+        """Refresh the template and copy it to instance_path"""
+        # Hold the lock through the copy so another job's refresh cannot rewrite files mid-copy
+        async with self._template_lock:
+            await self._ensure_template()
+
+            logger.info(f"Copying template to {instance_path}")
+            try:
+                # Hardlink copy: only files written per instance (.env) take new space
+                await self._run([
+                    "cp", "-al", str(self.template_dir), str(instance_path)
+                ], check=True)
+
+                # git appends to reflogs in place, so each instance gets a real copy of .git
+                shutil.rmtree(instance_path / ".git")
+                await self._run([
+                    "cp", "-a", str(self.template_dir / ".git"), str(instance_path / ".git")
+                ], check=True)
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Template copy failed: {e}")
+                raise Exception(f"Failed to copy repository template: {e.stderr}")
+
+    async def create_instance(self, chat_id: str, discord_token: str, telegram_token: str, topics_channel_id: str) -> Dict:
         """Create a new TGCrossChat instance"""
+        # Every instance shares the manager DM's chat id, so track progress per stack
+        instance_hash = self.generate_instance_hash(chat_id, discord_token, telegram_token)
+        try:
+            return await self._create_instance(chat_id, discord_token, telegram_token, topics_channel_id)
+        finally:
+            self._create_phase.pop(instance_hash, None)
+
+    async def _create_instance(self, chat_id: str, discord_token: str, telegram_token: str, topics_channel_id: str) -> Dict:
         # Generate unique hash for this instance
         instance_hash = self.generate_instance_hash(chat_id, discord_token, telegram_token)
 
@@ -95,26 +341,20 @@ class InstanceManager:
             "telegram_token": telegram_token,
             "topics_channel_id": topics_channel_id,
             "docker_stack_name": instance_hash,
+            "short_id": instance_hash[:8],
             "status": "running"
         }
 
-        # Clone repository
+        # Copy repository from the shared template
         instance_path = self.instances_dir / instance_hash
         if instance_path.exists():
             shutil.rmtree(instance_path)
 
-        logger.info(f"Cloning repository to {instance_path}")
-        try:
-            subprocess.run([
-                "git", "clone",
-                "https://github.com/zlc1004/tgcrosschat.git",
-                str(instance_path)
-            ], check=True, capture_output=True, text=True)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Git clone failed: {e}")
-            raise Exception(f"Failed to clone repository: {e.stderr}")
+        self._create_phase[instance_hash] = "cloning"
+        await self._copy_template(instance_path)
 
         # Create .env file
+        self._create_phase[instance_hash] = "configuring"
         env_example_path = instance_path / ".env.example"
         env_path = instance_path / ".env"
 
@@ -136,10 +376,11 @@ class InstanceManager:
 
         # Start Docker Compose
         logger.info(f"Starting Docker Compose for instance {instance_hash}")
+        self._create_phase[instance_hash] = "starting"
         try:
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", instance_hash, "up", "-d"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
         except subprocess.CalledProcessError as e:
             logger.error(f"Docker compose failed: {e}")
             # Clean up on failure
@@ -148,13 +389,19 @@ class InstanceManager:
             raise Exception(f"Failed to start Docker containers: {e.stderr}")
 
         # Save instance data
-        self.instances.append(instance_data)
-        self.save_data()
+        with self._lock:
+            self.instances.append(instance_data)
+            self._by_stack[instance_hash] = instance_data
+            self._by_chat.setdefault(chat_id, []).append(instance_data)
+            self._cache = None
+            self._dirty = True
+        await asyncio.to_thread(self.save_data)
 
         return instance_data
 
-    def pause_instance(self, docker_stack_name: str) -> bool:
+    async def pause_instance(self, docker_stack_name: str) -> bool:
         """Pause a TGCrossChat instance (stop containers but keep data)"""
+        self._status_cache.pop(docker_stack_name, None)
         instance_path = self.instances_dir / docker_stack_name
 
         if not instance_path.exists():
@@ -162,24 +409,22 @@ class InstanceManager:
 
         try:
             # Stop Docker Compose (without removing volumes)
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", docker_stack_name, "stop"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
             # Update instance status
-            for instance in self.instances:
-                if instance["docker_stack_name"] == docker_stack_name:
-                    instance["status"] = "stopped"
-                    break
-            self.save_data()
+            self._set_status(docker_stack_name, "stopped")
+            await asyncio.to_thread(self.save_data)
 
             return True
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to pause instance {docker_stack_name}: {e}")
             return False
 
-    def resume_instance(self, docker_stack_name: str) -> bool:
+    async def resume_instance(self, docker_stack_name: str) -> bool:
         """Resume a TGCrossChat instance"""
+        self._status_cache.pop(docker_stack_name, None)
         instance_path = self.instances_dir / docker_stack_name
 
         if not instance_path.exists():
@@ -187,24 +432,22 @@ class InstanceManager:
 
         try:
             # Start Docker Compose
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", docker_stack_name, "up", "-d"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
             # Update instance status
-            for instance in self.instances:
-                if instance["docker_stack_name"] == docker_stack_name:
-                    instance["status"] = "running"
-                    break
-            self.save_data()
+            self._set_status(docker_stack_name, "running")
+            await asyncio.to_thread(self.save_data)
 
             return True
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to resume instance {docker_stack_name}: {e}")
             return False
 
-    def stop_instance(self, docker_stack_name: str) -> bool:
+    async def stop_instance(self, docker_stack_name: str) -> bool:
         """Stop and remove a TGCrossChat instance completely"""
+        self._status_cache.pop(docker_stack_name, None)
         instance_path = self.instances_dir / docker_stack_name
 
         if not instance_path.exists():
@@ -212,52 +455,106 @@ class InstanceManager:
 
         try:
             # Stop Docker Compose
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", docker_stack_name, "down", "-v"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
-            # Remove instance directory
-            shutil.rmtree(instance_path)
+            # Move the directory aside so the name is free again, then delete it in the background
+            trash_path = self.instances_dir / f".trash-{docker_stack_name}-{time.monotonic_ns()}"
+            instance_path.rename(trash_path)
+            task = asyncio.create_task(asyncio.to_thread(self._purge_trash))
+            self._cleanup_tasks.add(task)
+            task.add_done_callback(self._cleanup_tasks.discard)
 
             # Remove from instances list
-            self.instances = [inst for inst in self.instances if inst["docker_stack_name"] != docker_stack_name]
-            self.save_data()
+            with self._lock:
+                self._status_cache.pop(docker_stack_name, None)
+                instance = self._by_stack.pop(docker_stack_name, None)
+                if instance:
+                    self.instances.remove(instance)
+                    matches = self._by_chat.get(instance["chatid"], [])
+                    matches[:] = [other for other in matches if other is not instance]
+                    if not matches:
+                        self._by_chat.pop(instance["chatid"], None)
+                    self._dirty = True
+                self._cache = None
+            await asyncio.to_thread(self.save_data)
 
             return True
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to stop instance {docker_stack_name}: {e}")
             return False
 
-    def get_instance_status(self, docker_stack_name: str) -> str:
-        """Get the current status of an instance"""
+    def _purge_trash(self):
+        """Delete directories of removed instances, retrying any left over from earlier attempts"""
+        def log_failure(func, path, exc_info):
+            # Another purge running at the same time may have removed it already
+            if not isinstance(exc_info[1], FileNotFoundError):
+                logger.error(f"Failed to delete {path}: {exc_info[1]}")
+
+        for trash_path in self.instances_dir.glob(".trash-*"):
+            shutil.rmtree(trash_path, onerror=log_failure)
+            if trash_path.exists():
+                logger.error(f"Could not fully delete {trash_path}; will retry on the next instance removal")
+
+    async def get_instance_status(self, docker_stack_name: str) -> str:
+        """Get the current status of an instance (cached for STATUS_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        hit = self._status_cache.get(docker_stack_name)
+        if hit and now - hit[0] < STATUS_CACHE_TTL:
+            return hit[1]
+
+        status = await self._probe_instance_status(docker_stack_name)
+        self._status_cache[docker_stack_name] = (now, status)
+        return status
+
+    async def refresh_all_statuses(self) -> Dict[str, str]:
+        """Get the status of every instance with a single container listing"""
+        try:
+            containers = await asyncio.to_thread(self._list_containers)
+        except DOCKER_ERRORS as e:
+            logger.error(f"Failed to list containers: {e}")
+            return {instance["docker_stack_name"]: "unknown" for instance in self.list_instances()}
+
+        running_projects = {
+            container.labels.get("com.docker.compose.project")
+            for container in containers
+            if container.status == "running"
+        }
+
+        now = time.monotonic()
+        statuses = {}
+        for instance in self.list_instances():
+            name = instance["docker_stack_name"]
+            if not (self.instances_dir / name).exists():
+                status = "missing"
+            elif name in running_projects:
+                status = "running"
+            else:
+                status = "stopped"
+            statuses[name] = status
+            self._status_cache[name] = (now, status)
+
+        return statuses
+
+    async def _probe_instance_status(self, docker_stack_name: str) -> str:
+        """Ask Docker for the current status of an instance"""
         instance_path = self.instances_dir / docker_stack_name
 
         if not instance_path.exists():
             return "missing"
 
         try:
-            # Check if containers are running
-            result = subprocess.run([
-                "docker", "compose", "-p", docker_stack_name, "ps", "-q"
-            ], cwd=instance_path, capture_output=True, text=True)
-
-            if result.returncode == 0 and result.stdout.strip():
-                # Check if containers are actually running
-                container_ids = result.stdout.strip().split('\n')
-                for container_id in container_ids:
-                    if container_id:
-                        inspect_result = subprocess.run([
-                            "docker", "inspect", "-f", "{{.State.Running}}", container_id
-                        ], capture_output=True, text=True)
-                        if inspect_result.returncode == 0 and "true" in inspect_result.stdout:
-                            return "running"
-                return "stopped"
-            else:
-                return "stopped"
-        except subprocess.CalledProcessError:
+            containers = await asyncio.to_thread(self._list_containers, docker_stack_name)
+        except DOCKER_ERRORS as e:
+            logger.warning(f"Failed to probe status of {docker_stack_name}: {e}")
             return "unknown"
 
-    def get_instance_details(self, docker_stack_name: str) -> dict:
+        if any(container.status == "running" for container in containers):
+            return "running"
+        return "stopped"
+
+    async def get_instance_details(self, docker_stack_name: str) -> dict:
         """Get detailed Docker information for an instance"""
         instance_path = self.instances_dir / docker_stack_name
 
@@ -266,9 +563,9 @@ class InstanceManager:
 
         try:
             # Get container information using docker compose ps with JSON format
-            compose_result = subprocess.run([
+            compose_result = await self._run([
                 "docker", "compose", "-p", docker_stack_name, "ps", "--format", "json"
-            ], cwd=instance_path, capture_output=True, text=True)
+            ], cwd=instance_path)
 
             details = {
                 "instance_path": str(instance_path),
@@ -277,52 +574,21 @@ class InstanceManager:
             }
 
             if compose_result.returncode == 0 and compose_result.stdout.strip():
-                # Parse JSON output
-                import json
+                # Parse JSON output, one container per line
                 for line in compose_result.stdout.strip().split('\n'):
                     if line:
                         try:
-                            container_info = json.loads(line)
+                            container_info = orjson.loads(line)
                             details["containers"].append(container_info)
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             continue
 
-            # Get additional container details if containers exist
-            if details["containers"]:
-                for container in details["containers"]:
-                    container_id = container.get("ID", "")
-                    if container_id:
-                        # Get detailed container inspection
-                        inspect_result = subprocess.run([
-                            "docker", "inspect", container_id
-                        ], capture_output=True, text=True)
-
-                        if inspect_result.returncode == 0:
-                            try:
-                                import json
-                                inspect_data = json.loads(inspect_result.stdout)[0]
-
-                                # Add useful information
-                                container["detailed_info"] = {
-                                    "created": inspect_data.get("Created", ""),
-                                    "started_at": inspect_data.get("State", {}).get("StartedAt", ""),
-                                    "finished_at": inspect_data.get("State", {}).get("FinishedAt", ""),
-                                    "restart_count": inspect_data.get("RestartCount", 0),
-                                    "platform": inspect_data.get("Platform", ""),
-                                    "image": inspect_data.get("Config", {}).get("Image", ""),
-                                    "ports": inspect_data.get("NetworkSettings", {}).get("Ports", {}),
-                                    "mounts": [
-                                        {
-                                            "source": mount.get("Source", ""),
-                                            "destination": mount.get("Destination", ""),
-                                            "type": mount.get("Type", "")
-                                        }
-                                        for mount in inspect_data.get("Mounts", [])
-                                    ],
-                                    "memory_usage": self._get_container_stats(container_id)
-                                }
-                            except (json.JSONDecodeError, IndexError):
-                                container["detailed_info"] = {"error": "Failed to parse inspect data"}
+            # Inspect all containers concurrently
+            await asyncio.gather(*(
+                self._add_container_details(container)
+                for container in details["containers"]
+                if container.get("ID")
+            ))
 
             return details
 
@@ -331,33 +597,59 @@ class InstanceManager:
         except Exception as e:
             return {"error": f"Unexpected error: {e}"}
 
-    def _get_container_stats(self, container_id: str) -> dict:
+    async def _add_container_details(self, container: dict):
+        """Attach inspect data and resource usage to a compose ps entry"""
+        container_id = container["ID"]
+
+        # Run inspect and stats side by side
+        inspect_data, memory_usage = await asyncio.gather(
+            asyncio.to_thread(self._inspect_container, container_id),
+            self._get_container_stats(container_id),
+            return_exceptions=True
+        )
+
+        if isinstance(inspect_data, BaseException):
+            return
+
+        try:
+            # Add useful information
+            container["detailed_info"] = {
+                "created": inspect_data.get("Created", ""),
+                "started_at": inspect_data.get("State", {}).get("StartedAt", ""),
+                "finished_at": inspect_data.get("State", {}).get("FinishedAt", ""),
+                "restart_count": inspect_data.get("RestartCount", 0),
+                "platform": inspect_data.get("Platform", ""),
+                "image": inspect_data.get("Config", {}).get("Image", ""),
+                "ports": inspect_data.get("NetworkSettings", {}).get("Ports", {}),
+                "mounts": [
+                    {
+                        "source": mount.get("Source", ""),
+                        "destination": mount.get("Destination", ""),
+                        "type": mount.get("Type", "")
+                    }
+                    for mount in inspect_data.get("Mounts", [])
+                ],
+                "memory_usage": memory_usage
+            }
+        except (AttributeError, TypeError):
+            container["detailed_info"] = {"error": "Failed to parse inspect data"}
+
+    async def _get_container_stats(self, container_id: str) -> dict:
         """Get container resource usage statistics"""
         try:
-            stats_result = subprocess.run([
-                "docker", "stats", container_id, "--no-stream", "--format",
-                "table {{.Container}}\t{{.CPUPerc}}\t{{.MemUsage}}\t{{.NetIO}}\t{{.BlockIO}}"
-            ], capture_output=True, text=True, timeout=5)
-
-            if stats_result.returncode == 0:
-                lines = stats_result.stdout.strip().split('\n')
-                if len(lines) > 1:  # Skip header
-                    parts = lines[1].split('\t')
-                    if len(parts) >= 5:
-                        return {
-                            "cpu_usage": parts[1],
-                            "memory_usage": parts[2],
-                            "network_io": parts[3],
-                            "block_io": parts[4]
-                        }
-            return {"error": "Stats not available"}
-        except subprocess.TimeoutExpired:
+            stats = await asyncio.wait_for(
+                asyncio.to_thread(self._container_stats, container_id),
+                timeout=5
+            )
+            return format_container_stats(stats)
+        except asyncio.TimeoutError:
             return {"error": "Stats timeout"}
         except Exception:
             return {"error": "Stats unavailable"}
 
-    def edit_instance_preserve_db(self, docker_stack_name: str, env_key: str, new_value: str) -> bool:
+    async def edit_instance_preserve_db(self, docker_stack_name: str, env_key: str, new_value: str) -> bool:
         """Edit instance by stopping containers, editing .env, and restarting"""
+        self._status_cache.pop(docker_stack_name, None)
         instance_path = self.instances_dir / docker_stack_name
 
         if not instance_path.exists():
@@ -372,9 +664,9 @@ class InstanceManager:
         try:
             # Stop containers
             logger.info(f"Stopping containers for instance {docker_stack_name}")
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", docker_stack_name, "down"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
             # Read current .env file
             with open(env_path, 'r') as f:
@@ -402,16 +694,13 @@ class InstanceManager:
 
             # Start containers
             logger.info(f"Starting containers for instance {docker_stack_name}")
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", docker_stack_name, "up", "-d"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
             # Update instance status
-            for instance in self.instances:
-                if instance["docker_stack_name"] == docker_stack_name:
-                    instance["status"] = "running"
-                    break
-            self.save_data()
+            self._set_status(docker_stack_name, "running")
+            await asyncio.to_thread(self.save_data)
 
             logger.info(f"Successfully updated {env_key} for instance {docker_stack_name}")
             return True
@@ -423,14 +712,15 @@ class InstanceManager:
             logger.error(f"Unexpected error editing instance {docker_stack_name}: {e}")
             return False
 
-    def recreate_instance(self, instance_index: int, discord_token: str = None, telegram_token: str = None, topics_channel_id: str = None) -> bool:
-        """Recreate instance by deleting and creating new one"""
-        if instance_index < 0 or instance_index >= len(self.instances):
-            logger.error(f"Invalid instance index: {instance_index}")
-            return False
+    async def recreate_instance(self, docker_stack_name: str, discord_token: str = None, telegram_token: str = None, topics_channel_id: str = None) -> Optional[Dict]:
+        """Recreate instance by deleting and creating new one; returns the new instance"""
+        # Look up by stack name: list indexes shift if another instance is deleted while this job waits
+        instance = self._by_stack.get(docker_stack_name)
+        if instance is None:
+            logger.error(f"Instance no longer exists: {docker_stack_name}")
+            return None
 
-        instance = self.instances[instance_index]
-        old_stack_name = instance['docker_stack_name']
+        old_stack_name = docker_stack_name
         chatid = instance['chatid']
 
         # Use new values or keep existing ones
@@ -441,21 +731,22 @@ class InstanceManager:
         try:
             # Stop and remove old instance
             logger.info(f"Removing old instance {old_stack_name}")
-            self.stop_instance(old_stack_name)
+            await self.stop_instance(old_stack_name)
 
             # Create new instance with updated values
             logger.info(f"Creating new instance for chat {chatid}")
-            new_instance = self.create_instance(chatid, new_discord_token, new_telegram_token, new_topics_channel_id)
+            new_instance = await self.create_instance(chatid, new_discord_token, new_telegram_token, new_topics_channel_id)
 
             logger.info(f"Successfully recreated instance. Old: {old_stack_name}, New: {new_instance['docker_stack_name']}")
-            return True
+            return new_instance
 
         except Exception as e:
             logger.error(f"Failed to recreate instance {old_stack_name}: {e}")
-            return False
+            return None
 
-    def update_instance(self, docker_stack_name: str) -> bool:
+    async def update_instance(self, docker_stack_name: str) -> bool:
         """Update instance: docker compose down, git pull, docker compose up -d --build"""
+        self._status_cache.pop(docker_stack_name, None)
         instance_path = self.instances_dir / docker_stack_name
 
         if not instance_path.exists():
@@ -465,28 +756,25 @@ class InstanceManager:
         try:
             # Step 1: Stop containers
             logger.info(f"Stopping containers for instance {docker_stack_name}")
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", docker_stack_name, "down"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
             # Step 2: Git pull latest changes
             logger.info(f"Pulling latest code for instance {docker_stack_name}")
-            subprocess.run([
+            await self._run([
                 "git", "pull"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
             # Step 3: Start containers with rebuild
             logger.info(f"Rebuilding and starting containers for instance {docker_stack_name}")
-            subprocess.run([
+            await self._run([
                 "docker", "compose", "-p", docker_stack_name, "up", "-d", "--build"
-            ], cwd=instance_path, check=True, capture_output=True, text=True)
+            ], cwd=instance_path, check=True)
 
             # Update instance status
-            for instance in self.instances:
-                if instance["docker_stack_name"] == docker_stack_name:
-                    instance["status"] = "running"
-                    break
-            self.save_data()
+            self._set_status(docker_stack_name, "running")
+            await asyncio.to_thread(self.save_data)
 
             logger.info(f"Successfully updated instance {docker_stack_name}")
             return True
@@ -499,44 +787,195 @@ class InstanceManager:
             logger.error(f"Unexpected error updating instance {docker_stack_name}: {e}")
             return False
 
+    def get_by_index(self, index: Optional[int]) -> Optional[Dict]:
+        """Get the instance at a list position, or None if it no longer exists"""
+        instances = self.instances
+        if index is not None and 0 <= index < len(instances):
+            return instances[index]
+        return None
+
     def list_instances(self) -> List[Dict]:
-        """List all instances"""
-        return self.instances.copy()
+        """List all instances (cached until the instance list changes)"""
+        # Fast path: the snapshot is only ever replaced wholesale, so reading it needs no lock
+        cache = self._cache
+        if cache is not None:
+            return cache
+        with self._lock:
+            if self._cache is None:
+                self._cache = self.instances.copy()
+            return self._cache
 
 # Global instance manager
 instance_manager = InstanceManager()
 
-async def is_authorized_chat(update: Update) -> bool:
-    """Check if the message is from authorized user in DM"""
-    if not update.effective_chat or not update.effective_user:
+# Limit how many heavy Docker/git operations run at the same time
+DOCKER_SEMAPHORE = asyncio.Semaphore(2)
+
+async def run_docker_job(func, *args, **kwargs):
+    """Run a heavy instance manager coroutine once a Docker slot is free"""
+    async with DOCKER_SEMAPHORE:
+        return await func(*args, **kwargs)
+
+class DataPersister:
+    """Debounces data.json writes requested from handlers into one background task"""
+
+    def __init__(self, manager: InstanceManager, delay: float = 0.1):
+        self.manager = manager
+        self.delay = delay
+        self.dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self):
+        """Schedule a save; back-to-back calls are batched into one write"""
+        self.manager.mark_dirty()
+        self.dirty.set()
+
+    async def _run(self):
+        while True:
+            await self.dirty.wait()
+            await asyncio.sleep(self.delay)
+            self.dirty.clear()
+            await asyncio.to_thread(self.manager.save_data)
+
+    def start(self):
+        """Start the persistence task on the running event loop"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the persistence task and flush any pending changes"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # save_data() skips the write when nothing changed, and the manager can be dirty
+        # without this event being set (internal changes, a failed earlier write)
+        self.dirty.clear()
+        await asyncio.to_thread(self.manager.save_data)
+
+persister = DataPersister(instance_manager)
+
+def mark_dirty():
+    """Persist instance data changes made by handlers"""
+    persister.mark_dirty()
+
+class Session:
+    """Per-user state for the instance creation and edit conversations"""
+    __slots__ = (
+        "creating_instance", "chat_id", "discord_token", "telegram_token",
+        "edit_type", "editing", "edit_instance_index", "preserve_db"
+    )
+
+    def __init__(self):
+        self.creating_instance = False
+        self.chat_id: Optional[str] = None
+        self.discord_token: Optional[str] = None
+        self.telegram_token: Optional[str] = None
+        self.edit_type: Optional[str] = None
+        self.editing: Optional[str] = None  # Field awaiting text input
+        self.edit_instance_index: Optional[int] = None
+        self.preserve_db = True  # Default true
+
+def get_session(context: ContextTypes.DEFAULT_TYPE) -> Session:
+    """Get the user's session, creating it on first use"""
+    session = context.user_data.get('session')
+    if session is None:
+        session = context.user_data['session'] = Session()
+    return session
+
+def end_session(context: ContextTypes.DEFAULT_TYPE):
+    """Drop the user's session state"""
+    context.user_data.pop('session', None)
+
+# Static menus, built once and shared by every handler that shows them
+MAIN_MENU_TEXT = (
+    "🤖 **TGCrossChat Manager**\n\n"
+    "Welcome to the TGCrossChat instance manager!\n"
+    "Use the buttons below to manage your instances."
+)
+
+MAIN_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📋 List Instances", callback_data="list_instances")],
+    [InlineKeyboardButton("➕ Create Instance", callback_data="create_instance")],
+    [InlineKeyboardButton("⚙️ Manage Instances", callback_data="stop_instance")],
+    [InlineKeyboardButton("🔑 Get Token", callback_data="get_token")],
+    [InlineKeyboardButton("ℹ️ Help", callback_data="help")]
+])
+
+BACK_TO_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_menu")]
+])
+
+HELP_TEXT = """
+ℹ️ **TGCrossChat Manager Help**
+
+**Commands:**
+• `/start` - Show main menu
+• `/status` - Quick status overview
+
+**Features:**
+• **Create Instance** - Set up a new TGCrossChat bridge
+• **List Instances** - View all active instances
+• **Stop Instance** - Remove an instance and clean up
+
+**Instance Creation Process:**
+1. Provide Discord user token (selfbot)
+2. Provide Telegram bot token
+3. Provide Telegram topics channel ID
+4. System automatically creates and starts instance
+
+**Notes:**
+• Each chat can only have one active instance
+• Instances are isolated using Docker containers
+• All data is cleaned up when stopping instances
+• Use Discord user tokens, not bot tokens
+""".strip()
+
+# Telegram user id of the authorized user, learned on their first update
+authorized_user_id: Optional[int] = None
+
+def is_authorized(chat, user) -> bool:
+    """Check that a chat/user pair is the authorized user in DM"""
+    global authorized_user_id
+
+    if not chat or not user:
         return False
 
     # Must be a private chat (DM)
-    if update.effective_chat.type != "private":
+    if chat.type != "private":
         return False
 
+    # Compare ids once the authorized user is known; ids never change, usernames can
+    if authorized_user_id is not None:
+        return user.id == authorized_user_id
+
     # Must be from the authorized username
-    return update.effective_user.username == config.telegram_username
+    if user.username == config.telegram_username:
+        authorized_user_id = user.id
+        return True
+    return False
 
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /start command"""
-    if not await is_authorized_chat(update):
-        return
+async def is_authorized_chat(update: Update) -> bool:
+    """Check if the message is from authorized user in DM"""
+    return is_authorized(update.effective_chat, update.effective_user)
 
-    keyboard = [
-        [InlineKeyboardButton("📋 List Instances", callback_data="list_instances")],
-        [InlineKeyboardButton("➕ Create Instance", callback_data="create_instance")],
-        [InlineKeyboardButton("⚙️ Manage Instances", callback_data="stop_instance")],
-        [InlineKeyboardButton("🔑 Get Token", callback_data="get_token")],
-        [InlineKeyboardButton("ℹ️ Help", callback_data="help")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+class AuthorizedUser(filters.MessageFilter):
+    """Filter that only lets through messages from the authorized user in DM"""
+
+    def filter(self, message) -> bool:
+        return is_authorized(message.chat, message.from_user)
+
+# Rejects unauthorized commands in the dispatcher, before a handler is scheduled
+AUTHORIZED_USER = AuthorizedUser()
 
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /start command"""
     await update.message.reply_text(
-        "🤖 **TGCrossChat Manager**\n\n"
-        "Welcome to the TGCrossChat instance manager!\n"
-        "Use the buttons below to manage your instances.",
-        reply_markup=reply_markup,
+        MAIN_MENU_TEXT,
+        reply_markup=MAIN_MENU_MARKUP,
         parse_mode=ParseMode.MARKDOWN
     )
 
@@ -548,194 +987,33 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    if query.data == "list_instances":
-        await list_instances_callback(update, context)
-    elif query.data == "create_instance":
-        await create_instance_callback(update, context)
-    elif query.data == "stop_instance":
-        await stop_instance_callback(update, context)
-    elif query.data == "get_token":
-        await get_token_callback(update, context)
-    elif query.data == "start_token_extraction":
-        await start_token_extraction_callback(update, context)
-    elif query.data == "qr_scanned":
-        await qr_scanned_callback(update, context)
-    elif query.data == "rescreenshot_qr":
-        await rescreenshot_qr_callback(update, context)
-    elif query.data == "cancel_token_extraction":
-        await cancel_token_extraction_callback(update, context)
-    elif query.data == "back_to_menu":
-        await back_to_menu_callback(update, context)
-    elif query.data == "help":
-        await help_callback(update, context)
-    elif query.data.startswith("manage_"):
-        try:
-            instance_index = int(query.data[7:])  # Remove "manage_" prefix
-            await manage_instance_callback(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Instance Selection**\n\n"
-                "Please try again or return to the main menu.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("pause_"):
-        try:
-            instance_index = int(query.data[6:])  # Remove "pause_" prefix
-            await pause_instance_action(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("resume_"):
-        try:
-            instance_index = int(query.data[7:])  # Remove "resume_" prefix
-            await resume_instance_action(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("edit_discord_token_"):
-        try:
-            instance_index = int(query.data[19:])  # Remove "edit_discord_token_" prefix
-            await edit_discord_token_callback(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("edit_telegram_token_"):
-        try:
-            instance_index = int(query.data[20:])  # Remove "edit_telegram_token_" prefix
-            await edit_telegram_token_callback(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("edit_topics_channel_"):
-        try:
-            instance_index = int(query.data[20:])  # Remove "edit_topics_channel_" prefix
-            await edit_topics_channel_callback(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("preserve_db_"):
-        try:
-            instance_index = int(query.data[12:])  # Remove "preserve_db_" prefix
-            await toggle_preserve_db(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("start_edit_discord_"):
-        try:
-            instance_index = int(query.data[19:])  # Remove "start_edit_discord_" prefix
-            await start_edit_discord_token(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("start_edit_telegram_"):
-        try:
-            instance_index = int(query.data[20:])  # Remove "start_edit_telegram_" prefix
-            await start_edit_telegram_token(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("start_edit_topics_"):
-        try:
-            instance_index = int(query.data[18:])  # Remove "start_edit_topics_" prefix
-            await start_edit_topics_channel(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("edit_"):
-        try:
-            instance_index = int(query.data[5:])  # Remove "edit_" prefix
-            await edit_instance_callback(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("update_"):
-        try:
-            instance_index = int(query.data[7:])  # Remove "update_" prefix
-            await update_instance_action(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("recreate_"):
-        try:
-            instance_index = int(query.data[9:])  # Remove "recreate_" prefix
-            await recreate_instance_action(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("delete_"):
-        try:
-            instance_index = int(query.data[7:])  # Remove "delete_" prefix
-            await delete_instance_action(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("confirm_delete_"):
-        try:
-            instance_index = int(query.data[15:])  # Remove "confirm_delete_" prefix
-            await confirm_delete_instance(update, context, instance_index)
-        except ValueError:
-            await query.edit_message_text(
-                "❌ **Invalid Action**\n\n"
-                "Please try again.",
-                parse_mode=ParseMode.MARKDOWN
-            )
-    elif query.data.startswith("details_"):
-        try:
-            instance_index = int(query.data[8:])  # Remove "details_" prefix
-            await show_instance_details(update, context, instance_index)
-        except ValueError:
+    # Plain actions, e.g. "list_instances"
+    handler = CALLBACK_HANDLERS.get(query.data)
+    if handler:
+        await handler(update, context)
+        return
+
+    # Per-instance actions, e.g. "edit_discord_token_3"
+    action, _, index = query.data.rpartition("_")
+    handler = INSTANCE_CALLBACK_HANDLERS.get(action)
+    if handler:
+        if not index.isdecimal():
             await query.edit_message_text(
                 "❌ **Invalid Action**\n\n"
                 "Please try again.",
                 parse_mode=ParseMode.MARKDOWN
             )
-    else:
-        # Fallback for unrecognized callback data
-        await query.edit_message_text(
-            "❌ **Unknown Action**\n\n"
-            f"Callback data: `{query.data}`\n\n"
-            "Please return to the main menu and try again.",
-            parse_mode=ParseMode.MARKDOWN
-        )
+            return
+        await handler(update, context, int(index))
+        return
+
+    # Fallback for unrecognized callback data
+    await query.edit_message_text(
+        "❌ **Unknown Action**\n\n"
+        f"Callback data: `{query.data}`\n\n"
+        "Please return to the main menu and try again.",
+        parse_mode=ParseMode.MARKDOWN
+    )
 
 async def list_instances_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """List all instances with status"""
@@ -748,23 +1026,26 @@ async def list_instances_callback(update: Update, context: ContextTypes.DEFAULT_
         )
         return
 
-    message = "📋 **Instance List**\n\n"
-    for i, instance in enumerate(instances, 1):
-        short_id = instance['docker_stack_name'][:8]
+    # Get real-time status of every instance at once
+    statuses = await instance_manager.refresh_all_statuses()
 
-        # Get real-time status
-        real_status = instance_manager.get_instance_status(instance['docker_stack_name'])
-        status_emoji = "🟢" if real_status == "running" else "🔴" if real_status == "stopped" else "🟡"
+    parts = ["📋 **Instance List**\n\n"]
+    for i, instance in enumerate(instances, 1):
+        short_id = instance['short_id']
+        real_status = statuses.get(instance['docker_stack_name'], "unknown")
+        status_emoji = STATUS_EMOJI.get(real_status, "🟡")
+
+        parts.append(
+            f"**{i}.** Instance `{short_id}...` {status_emoji}\n"
+            f"   Chat ID: `{instance['chatid']}`\n"
+            f"   Topics Channel: `{instance['topics_channel_id']}`\n"
+            f"   Status: {real_status.title()}\n\n"
+        )
 
-        message += f"**{i}.** Instance `{short_id}...` {status_emoji}\n"
-        message += f"   Chat ID: `{instance['chatid']}`\n"
-        message += f"   Topics Channel: `{instance['topics_channel_id']}`\n"
-        message += f"   Status: {real_status.title()}\n\n"
+    parts.append("🟢 Running | 🔴 Stopped | 🟡 Unknown")
+    message = "".join(parts)
 
-    message += "🟢 Running | 🔴 Stopped | 🟡 Unknown"
-
-    keyboard = [[InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_menu")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = BACK_TO_MENU_MARKUP
 
     await update.callback_query.edit_message_text(
         message,
@@ -776,6 +1057,14 @@ async def create_instance_callback(update: Update, context: ContextTypes.DEFAULT
     """Start instance creation process"""
     chat_id = str(update.effective_chat.id)
 
+    if context.user_data.get('create_inflight'):
+        await update.callback_query.edit_message_text(
+            "⏳ **Instance Creation In Progress**\n\n"
+            "Please wait for the current instance to finish before creating another one.",
+            parse_mode=ParseMode.MARKDOWN
+        )
+        return ConversationHandler.END
+
     await update.callback_query.edit_message_text(
         "🔐 **Creating New Instance**\n\n"
         "Please provide your **Discord User Token**:\n\n"
@@ -784,8 +1073,9 @@ async def create_instance_callback(update: Update, context: ContextTypes.DEFAULT
         parse_mode=ParseMode.MARKDOWN
     )
 
-    context.user_data['creating_instance'] = True
-    context.user_data['chat_id'] = chat_id
+    session = get_session(context)
+    session.creating_instance = True
+    session.chat_id = chat_id
     return WAITING_DISCORD_TOKEN
 
 async def stop_instance_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -799,26 +1089,32 @@ async def stop_instance_callback(update: Update, context: ContextTypes.DEFAULT_T
         )
         return
 
+    # Get real-time status of every instance at once
+    statuses = await instance_manager.refresh_all_statuses()
+
     keyboard = []
+    changed = False
     for i, instance in enumerate(instances):
-        short_id = instance['docker_stack_name'][:8]
+        short_id = instance['short_id']
         current_status = instance.get('status', 'unknown')
-
-        # Get real-time status
-        real_status = instance_manager.get_instance_status(instance['docker_stack_name'])
+        real_status = statuses.get(instance['docker_stack_name'], "unknown")
 
         # Update stored status if different
         if real_status != current_status:
             instance['status'] = real_status
-            instance_manager.save_data()
+            changed = True
 
-        status_emoji = "🟢" if real_status == "running" else "🔴" if real_status == "stopped" else "🟡"
+        status_emoji = STATUS_EMOJI.get(real_status, "🟡")
 
         keyboard.append([InlineKeyboardButton(
             f"⚙️ Manage {short_id}... {status_emoji}",
             callback_data=f"manage_{i}"
         )])
 
+    # Save once for the whole batch of status changes
+    if changed:
+        mark_dirty()
+
     keyboard.append([InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_menu")])
     reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -832,9 +1128,9 @@ async def stop_instance_callback(update: Update, context: ContextTypes.DEFAULT_T
 
 async def manage_instance_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Show controls for a specific instance"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -842,23 +1138,25 @@ async def manage_instance_callback(update: Update, context: ContextTypes.DEFAULT
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
-    current_status = instance_manager.get_instance_status(instance['docker_stack_name'])
+    short_id = instance['short_id']
+    current_status = await instance_manager.get_instance_status(instance['docker_stack_name'])
 
-    # Update stored status
-    instance['status'] = current_status
-    instance_manager.save_data()
+    # Update stored status only if it changed
+    if instance.get('status') != current_status:
+        instance['status'] = current_status
+        mark_dirty()
 
-    status_emoji = "���" if current_status == "running" else "🔴" if current_status == "stopped" else "🟡"
+    status_emoji = STATUS_EMOJI.get(current_status, "🟡")
     status_text = current_status.title()
 
-    message = f"⚙️ **Instance Management**\n\n"
-    message += f"Instance: `{short_id}...`\n"
-    message += f"Chat ID: `{instance['chatid']}`\n"
-    message += f"Topics Channel: `{instance['topics_channel_id']}`\n"
-    message += f"Status: {status_emoji} {status_text}\n\n"
-    message += f"Choose an action:"
+    message = (
+        "⚙️ **Instance Management**\n\n"
+        f"Instance: `{short_id}...`\n"
+        f"Chat ID: `{instance['chatid']}`\n"
+        f"Topics Channel: `{instance['topics_channel_id']}`\n"
+        f"Status: {status_emoji} {status_text}\n\n"
+        "Choose an action:"
+    )
 
     keyboard = []
 
@@ -883,11 +1181,52 @@ async def manage_instance_callback(update: Update, context: ContextTypes.DEFAULT
         parse_mode=ParseMode.MARKDOWN
     )
 
-async def pause_instance_action(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
-    """Pause an instance"""
-    instances = instance_manager.list_instances()
-
-    if instance_index < 0 or instance_index >= len(instances):
+# action -> (InstanceManager method, progress text, success text, failure text)
+INSTANCE_ACTIONS = {
+    "pause": (
+        "pause_instance",
+        "⏸️ **Pausing Instance**\n\n"
+        "Stopping containers for `{short_id}...`\n"
+        "Please wait...",
+        "✅ **Instance Paused**\n\n"
+        "Instance `{short_id}...` has been paused.\n"
+        "Containers are stopped but data is preserved.\n\n"
+        "Use Resume to start it again.",
+        "❌ **Failed to Pause Instance**\n\n"
+        "Could not pause instance `{short_id}...`\n\n"
+        "Please check the logs for more details.",
+    ),
+    "resume": (
+        "resume_instance",
+        "▶️ **Resuming Instance**\n\n"
+        "Starting containers for `{short_id}...`\n"
+        "Please wait...",
+        "✅ **Instance Resumed**\n\n"
+        "Instance `{short_id}...` is now running.\n"
+        "The bridge should be active again.",
+        "❌ **Failed to Resume Instance**\n\n"
+        "Could not resume instance `{short_id}...`\n\n"
+        "Please check the logs for more details.",
+    ),
+    "delete": (
+        "stop_instance",
+        "🗑️ **Deleting Instance**\n\n"
+        "Removing instance `{short_id}...`\n"
+        "Please wait...",
+        "✅ **Instance Deleted**\n\n"
+        "Instance `{short_id}...` has been permanently deleted.\n\n"
+        "All containers and data have been removed.",
+        "❌ **Failed to Delete Instance**\n\n"
+        "Could not delete instance `{short_id}...`\n\n"
+        "Please check the logs for more details.",
+    ),
+}
+
+async def run_instance_action(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int, action: str):
+    """Pause, resume or delete an instance, reporting progress in the message"""
+    instance = instance_manager.get_by_index(instance_index)
+
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -895,82 +1234,27 @@ async def pause_instance_action(update: Update, context: ContextTypes.DEFAULT_TY
         )
         return
 
-    instance = instances[instance_index]
-    stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
+    method, progress_text, success_text, failure_text = INSTANCE_ACTIONS[action]
+    short_id = instance['short_id']
 
     # Show processing message
     await update.callback_query.edit_message_text(
-        f"⏸️ **Pausing Instance**\n\n"
-        f"Stopping containers for `{short_id}...`\n"
-        f"Please wait...",
+        progress_text.format(short_id=short_id),
         parse_mode=ParseMode.MARKDOWN
     )
 
-    success = instance_manager.pause_instance(stack_name)
+    success = await getattr(instance_manager, method)(instance['docker_stack_name'])
 
-    if success:
-        await update.callback_query.edit_message_text(
-            f"✅ **Instance Paused**\n\n"
-            f"Instance `{short_id}...` has been paused.\n"
-            f"Containers are stopped but data is preserved.\n\n"
-            f"Use Resume to start it again.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-    else:
-        await update.callback_query.edit_message_text(
-            f"❌ **Failed to Pause Instance**\n\n"
-            f"Could not pause instance `{short_id}...`\n\n"
-            f"Please check the logs for more details.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-
-async def resume_instance_action(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
-    """Resume an instance"""
-    instances = instance_manager.list_instances()
-
-    if instance_index < 0 or instance_index >= len(instances):
-        await update.callback_query.edit_message_text(
-            "❌ **Invalid Instance**\n\n"
-            "The selected instance no longer exists.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-        return
-
-    instance = instances[instance_index]
-    stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
-
-    # Show processing message
     await update.callback_query.edit_message_text(
-        f"▶️ **Resuming Instance**\n\n"
-        f"Starting containers for `{short_id}...`\n"
-        f"Please wait...",
+        (success_text if success else failure_text).format(short_id=short_id),
         parse_mode=ParseMode.MARKDOWN
     )
 
-    success = instance_manager.resume_instance(stack_name)
-
-    if success:
-        await update.callback_query.edit_message_text(
-            f"✅ **Instance Resumed**\n\n"
-            f"Instance `{short_id}...` is now running.\n"
-            f"The bridge should be active again.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-    else:
-        await update.callback_query.edit_message_text(
-            f"❌ **Failed to Resume Instance**\n\n"
-            f"Could not resume instance `{short_id}...`\n\n"
-            f"Please check the logs for more details.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-
 async def update_instance_action(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Update an instance (git pull + rebuild)"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -978,9 +1262,8 @@ async def update_instance_action(update: Update, context: ContextTypes.DEFAULT_T
         )
         return
 
-    instance = instances[instance_index]
     stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
+    short_id = instance['short_id']
 
     # Show processing message
     await update.callback_query.edit_message_text(
@@ -994,7 +1277,7 @@ async def update_instance_action(update: Update, context: ContextTypes.DEFAULT_T
     )
 
     try:
-        success = instance_manager.update_instance(stack_name)
+        success = await run_docker_job(instance_manager.update_instance, stack_name)
 
         if success:
             await update.callback_query.edit_message_text(
@@ -1026,9 +1309,9 @@ async def update_instance_action(update: Update, context: ContextTypes.DEFAULT_T
 
 async def recreate_instance_action(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Recreate an instance (delete and create fresh)"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1036,16 +1319,15 @@ async def recreate_instance_action(update: Update, context: ContextTypes.DEFAULT
         )
         return
 
-    instance = instances[instance_index]
     old_stack_name = instance['docker_stack_name']
-    short_id = old_stack_name[:8]
+    short_id = instance['short_id']
 
     # Show processing message
     await update.callback_query.edit_message_text(
         f"🔄 **Recreating Instance**\n\n"
         f"Instance: `{short_id}...`\n\n"
         f"⏳ Step 1/4: Stopping and removing old instance...\n"
-        f"⏳ Step 2/4: Cloning fresh code...\n"
+        f"⏳ Step 2/4: Fetching latest code...\n"
         f"⏳ Step 3/4: Setting up environment...\n"
         f"⏳ Step 4/4: Starting new instance...\n\n"
         f"⚠️ **Warning:** All data will be lost!\n"
@@ -1054,25 +1336,17 @@ async def recreate_instance_action(update: Update, context: ContextTypes.DEFAULT
     )
 
     try:
-        success = instance_manager.recreate_instance(instance_index)
-
-        if success:
-            # Get the new instance data after recreation
-            updated_instances = instance_manager.list_instances()
-            new_instance = None
-            for inst in updated_instances:
-                if inst['chatid'] == instance['chatid']:
-                    new_instance = inst
-                    break
+        new_instance = await run_docker_job(instance_manager.recreate_instance, old_stack_name)
 
-            new_short_id = new_instance['docker_stack_name'][:8] if new_instance else "unknown"
+        if new_instance:
+            new_short_id = new_instance['short_id']
 
             await update.callback_query.edit_message_text(
                 f"✅ **Instance Recreated Successfully**\n\n"
                 f"Old Instance: `{short_id}...`\n"
                 f"New Instance: `{new_short_id}...`\n\n"
                 f"✅ Old instance removed\n"
-                f"✅ Fresh code cloned\n"
+                f"✅ Latest code fetched\n"
                 f"✅ Environment configured\n"
                 f"✅ New instance started\n\n"
                 f"The instance has been completely recreated with fresh code and data.",
@@ -1098,9 +1372,9 @@ async def recreate_instance_action(update: Update, context: ContextTypes.DEFAULT
 
 async def delete_instance_action(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Delete an instance completely"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1108,9 +1382,8 @@ async def delete_instance_action(update: Update, context: ContextTypes.DEFAULT_T
         )
         return
 
-    instance = instances[instance_index]
     stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
+    short_id = instance['short_id']
 
     # Show confirmation
     keyboard = [
@@ -1131,11 +1404,45 @@ async def delete_instance_action(update: Update, context: ContextTypes.DEFAULT_T
         parse_mode=ParseMode.MARKDOWN
     )
 
+def _format_container(index: int, container: dict) -> str:
+    """Details view lines for one container (newline-terminated)"""
+    state = container.get("State", "Unknown")
+    state_emoji = CONTAINER_STATE_EMOJI.get(state, "🟡")
+    lines = [
+        f"**{index}. {container.get('Service', 'Unknown')}**\n"
+        f"   Name: `{container.get('Name', 'Unknown')}`\n"
+        f"   State: {state_emoji} {state}\n"
+        f"   Status: `{container.get('Status', 'Unknown')}`\n"
+    ]
+
+    # Add detailed info if available
+    detailed = container.get("detailed_info", {})
+    if detailed and "error" not in detailed:
+        if detailed.get("image"):
+            lines.append(f"   Image: `{detailed['image']}`\n")
+        if detailed.get("created"):
+            created = detailed["created"][:19].translate(TIMESTAMP_TRANS)  # Format timestamp
+            lines.append(f"   Created: `{created}`\n")
+        if detailed.get("restart_count", 0) > 0:
+            lines.append(f"   Restarts: `{detailed['restart_count']}`\n")
+
+        # Resource usage
+        memory_stats = detailed.get("memory_usage", {})
+        if memory_stats and "error" not in memory_stats:
+            lines.append(
+                f"   CPU: `{memory_stats.get('cpu_usage', 'N/A')}`\n"
+                f"   Memory: `{memory_stats.get('memory_usage', 'N/A')}`\n"
+                f"   Network: `{memory_stats.get('network_io', 'N/A')}`\n"
+                f"   Disk I/O: `{memory_stats.get('block_io', 'N/A')}`\n"
+            )
+
+    return "".join(lines)
+
 async def show_instance_details(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Show detailed Docker information for an instance"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1143,9 +1450,8 @@ async def show_instance_details(update: Update, context: ContextTypes.DEFAULT_TY
         )
         return
 
-    instance = instances[instance_index]
     stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
+    short_id = instance['short_id']
 
     # Show loading message
     await update.callback_query.edit_message_text(
@@ -1156,7 +1462,7 @@ async def show_instance_details(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
     # Get detailed information
-    details = instance_manager.get_instance_details(stack_name)
+    details = await instance_manager.get_instance_details(stack_name)
 
     if "error" in details:
         await update.callback_query.edit_message_text(
@@ -1169,56 +1475,35 @@ async def show_instance_details(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     # Format the details message
-    message = f"📊 **Instance Details**\n\n"
-    message += f"**Instance:** `{short_id}...`\n"
-    message += f"**Stack Name:** `{stack_name}`\n"
-    message += f"**Chat ID:** `{instance['chatid']}`\n"
-    message += f"**Topics Channel:** `{instance['topics_channel_id']}`\n\n"
+    parts = [
+        "📊 **Instance Details**",
+        "",
+        f"**Instance:** `{short_id}...`",
+        f"**Stack Name:** `{stack_name}`",
+        f"**Chat ID:** `{instance['chatid']}`",
+        f"**Topics Channel:** `{instance['topics_channel_id']}`",
+        "",
+    ]
 
     # Container information
     containers = details.get("containers", [])
     if containers:
-        message += f"**🐳 Containers ({len(containers)}):**\n\n"
+        parts.append(f"**🐳 Containers ({len(containers)}):**")
+        parts.append("")
 
+        running = sum(len(part) + 1 for part in parts)
         for i, container in enumerate(containers, 1):
-            name = container.get("Name", "Unknown")
-            service = container.get("Service", "Unknown")
-            state = container.get("State", "Unknown")
-            status = container.get("Status", "Unknown")
-
-            state_emoji = "🟢" if state == "running" else "🔴" if state == "exited" else "🟡"
-
-            message += f"**{i}. {service}**\n"
-            message += f"   Name: `{name}`\n"
-            message += f"   State: {state_emoji} {state}\n"
-            message += f"   Status: `{status}`\n"
-
-            # Add detailed info if available
-            detailed = container.get("detailed_info", {})
-            if detailed and "error" not in detailed:
-                if detailed.get("image"):
-                    message += f"   Image: `{detailed['image']}`\n"
-                if detailed.get("created"):
-                    created = detailed["created"][:19].replace("T", " ")  # Format timestamp
-                    message += f"   Created: `{created}`\n"
-                if detailed.get("restart_count", 0) > 0:
-                    message += f"   Restarts: `{detailed['restart_count']}`\n"
-
-                # Resource usage
-                memory_stats = detailed.get("memory_usage", {})
-                if memory_stats and "error" not in memory_stats:
-                    message += f"   CPU: `{memory_stats.get('cpu_usage', 'N/A')}`\n"
-                    message += f"   Memory: `{memory_stats.get('memory_usage', 'N/A')}`\n"
-                    message += f"   Network: `{memory_stats.get('network_io', 'N/A')}`\n"
-                    message += f"   Disk I/O: `{memory_stats.get('block_io', 'N/A')}`\n"
-
-            message += "\n"
+            section = _format_container(i, container)
+            # Stop before the container that would push the message past Telegram's limit
+            if running + len(section) + 1 > DETAILS_MESSAGE_LIMIT:
+                parts.append("... (truncated)")
+                break
+            parts.append(section)
+            running += len(section) + 1
     else:
-        message += "**🐳 Containers:** None found\n\n"
+        parts.append("**🐳 Containers:** None found")
 
-    # Truncate if message is too long (Telegram limit ~4096 characters)
-    if len(message) > 4000:
-        message = message[:3950] + "\n\n... (truncated)"
+    message = "\n".join(parts)
 
     keyboard = [
         [InlineKeyboardButton("🔄 Refresh Details", callback_data=f"details_{instance_index}")],
@@ -1232,52 +1517,11 @@ async def show_instance_details(update: Update, context: ContextTypes.DEFAULT_TY
         parse_mode=ParseMode.MARKDOWN
     )
 
-async def confirm_delete_instance(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
-    """Confirm and delete instance"""
-    instances = instance_manager.list_instances()
-
-    if instance_index < 0 or instance_index >= len(instances):
-        await update.callback_query.edit_message_text(
-            "❌ **Invalid Instance**\n\n"
-            "The selected instance no longer exists.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-        return
-
-    instance = instances[instance_index]
-    stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
-
-    # Show processing message
-    await update.callback_query.edit_message_text(
-        f"🗑️ **Deleting Instance**\n\n"
-        f"Removing instance `{short_id}...`\n"
-        f"Please wait...",
-        parse_mode=ParseMode.MARKDOWN
-    )
-
-    success = instance_manager.stop_instance(stack_name)
-
-    if success:
-        await update.callback_query.edit_message_text(
-            f"✅ **Instance Deleted**\n\n"
-            f"Instance `{short_id}...` has been permanently deleted.\n\n"
-            f"All containers and data have been removed.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-    else:
-        await update.callback_query.edit_message_text(
-            f"❌ **Failed to Delete Instance**\n\n"
-            f"Could not delete instance `{short_id}...`\n\n"
-            f"Please check the logs for more details.",
-            parse_mode=ParseMode.MARKDOWN
-        )
-
 async def edit_instance_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Show edit options for a specific instance"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1285,14 +1529,15 @@ async def edit_instance_callback(update: Update, context: ContextTypes.DEFAULT_T
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
+    short_id = instance['short_id']
 
-    message = f"✏️ **Edit Instance**\n\n"
-    message += f"Instance: `{short_id}...`\n"
-    message += f"Chat ID: `{instance['chatid']}`\n"
-    message += f"Topics Channel: `{instance['topics_channel_id']}`\n\n"
-    message += f"Choose what to edit:"
+    message = (
+        "✏️ **Edit Instance**\n\n"
+        f"Instance: `{short_id}...`\n"
+        f"Chat ID: `{instance['chatid']}`\n"
+        f"Topics Channel: `{instance['topics_channel_id']}`\n\n"
+        "Choose what to edit:"
+    )
 
     keyboard = [
         [InlineKeyboardButton("🔑 Discord Token", callback_data=f"edit_discord_token_{instance_index}")],
@@ -1310,9 +1555,9 @@ async def edit_instance_callback(update: Update, context: ContextTypes.DEFAULT_T
 
 async def edit_discord_token_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Show preserve DB option for Discord token edit"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1320,20 +1565,22 @@ async def edit_discord_token_callback(update: Update, context: ContextTypes.DEFA
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
+    short_id = instance['short_id']
 
     # Store edit context in user data
-    context.user_data['edit_type'] = 'discord_token'
-    context.user_data['instance_index'] = instance_index
-    preserve_db = context.user_data.get('preserve_db', True)  # Default true
+    session = get_session(context)
+    session.edit_type = 'discord_token'
+    session.edit_instance_index = instance_index
+    preserve_db = session.preserve_db
 
-    message = f"🔑 **Edit Discord Token**\n\n"
-    message += f"Instance: `{short_id}...`\n\n"
-    message += f"**Preserve Database:** {'✅ Yes' if preserve_db else '❌ No'}\n\n"
-    message += f"• **Yes (Default):** Stop container → Edit token → Restart\n"
-    message += f"• **No:** Delete instance → Recreate with new token\n\n"
-    message += f"Toggle the preserve database option:"
+    message = (
+        "🔑 **Edit Discord Token**\n\n"
+        f"Instance: `{short_id}...`\n\n"
+        f"**Preserve Database:** {'✅ Yes' if preserve_db else '❌ No'}\n\n"
+        "• **Yes (Default):** Stop container → Edit token → Restart\n"
+        "• **No:** Delete instance → Recreate with new token\n\n"
+        "Toggle the preserve database option:"
+    )
 
     keyboard = [
         [InlineKeyboardButton(f"🔄 Preserve DB: {'✅ Yes' if preserve_db else '❌ No'}", callback_data=f"preserve_db_{instance_index}")],
@@ -1350,9 +1597,9 @@ async def edit_discord_token_callback(update: Update, context: ContextTypes.DEFA
 
 async def edit_telegram_token_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Show preserve DB option for Telegram token edit"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1360,20 +1607,22 @@ async def edit_telegram_token_callback(update: Update, context: ContextTypes.DEF
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
+    short_id = instance['short_id']
 
     # Store edit context in user data
-    context.user_data['edit_type'] = 'telegram_token'
-    context.user_data['instance_index'] = instance_index
-    preserve_db = context.user_data.get('preserve_db', True)  # Default true
+    session = get_session(context)
+    session.edit_type = 'telegram_token'
+    session.edit_instance_index = instance_index
+    preserve_db = session.preserve_db
 
-    message = f"🤖 **Edit Telegram Bot Token**\n\n"
-    message += f"Instance: `{short_id}...`\n\n"
-    message += f"**Preserve Database:** {'✅ Yes' if preserve_db else '❌ No'}\n\n"
-    message += f"• **Yes (Default):** Stop container → Edit token → Restart\n"
-    message += f"• **No:** Delete instance → Recreate with new token\n\n"
-    message += f"Toggle the preserve database option:"
+    message = (
+        "🤖 **Edit Telegram Bot Token**\n\n"
+        f"Instance: `{short_id}...`\n\n"
+        f"**Preserve Database:** {'✅ Yes' if preserve_db else '❌ No'}\n\n"
+        "• **Yes (Default):** Stop container → Edit token → Restart\n"
+        "• **No:** Delete instance → Recreate with new token\n\n"
+        "Toggle the preserve database option:"
+    )
 
     keyboard = [
         [InlineKeyboardButton(f"🔄 Preserve DB: {'✅ Yes' if preserve_db else '❌ No'}", callback_data=f"preserve_db_{instance_index}")],
@@ -1390,9 +1639,9 @@ async def edit_telegram_token_callback(update: Update, context: ContextTypes.DEF
 
 async def edit_topics_channel_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Show preserve DB option for Topics channel edit"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1400,20 +1649,22 @@ async def edit_topics_channel_callback(update: Update, context: ContextTypes.DEF
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
+    short_id = instance['short_id']
 
     # Store edit context in user data
-    context.user_data['edit_type'] = 'topics_channel'
-    context.user_data['instance_index'] = instance_index
-    preserve_db = context.user_data.get('preserve_db', True)  # Default true
+    session = get_session(context)
+    session.edit_type = 'topics_channel'
+    session.edit_instance_index = instance_index
+    preserve_db = session.preserve_db
 
-    message = f"📋 **Edit Topics Channel ID**\n\n"
-    message += f"Instance: `{short_id}...`\n\n"
-    message += f"**Preserve Database:** {'✅ Yes' if preserve_db else '❌ No'}\n\n"
-    message += f"• **Yes (Default):** Stop container → Edit channel → Restart\n"
-    message += f"• **No:** Delete instance → Recreate with new channel\n\n"
-    message += f"Toggle the preserve database option:"
+    message = (
+        "📋 **Edit Topics Channel ID**\n\n"
+        f"Instance: `{short_id}...`\n\n"
+        f"**Preserve Database:** {'✅ Yes' if preserve_db else '❌ No'}\n\n"
+        "• **Yes (Default):** Stop container → Edit channel → Restart\n"
+        "• **No:** Delete instance → Recreate with new channel\n\n"
+        "Toggle the preserve database option:"
+    )
 
     keyboard = [
         [InlineKeyboardButton(f"🔄 Preserve DB: {'✅ Yes' if preserve_db else '❌ No'}", callback_data=f"preserve_db_{instance_index}")],
@@ -1430,10 +1681,10 @@ async def edit_topics_channel_callback(update: Update, context: ContextTypes.DEF
 
 async def toggle_preserve_db(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Toggle preserve database setting"""
-    current_preserve = context.user_data.get('preserve_db', True)
-    context.user_data['preserve_db'] = not current_preserve
+    session = get_session(context)
+    session.preserve_db = not session.preserve_db
 
-    edit_type = context.user_data.get('edit_type')
+    edit_type = session.edit_type
 
     # Redirect back to appropriate edit callback
     if edit_type == 'discord_token':
@@ -1445,9 +1696,9 @@ async def toggle_preserve_db(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
 async def start_edit_discord_token(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Start editing Discord token"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1455,17 +1706,19 @@ async def start_edit_discord_token(update: Update, context: ContextTypes.DEFAULT
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
-    preserve_db = context.user_data.get('preserve_db', True)
+    short_id = instance['short_id']
+    session = get_session(context)
+    preserve_db = session.preserve_db
 
-    message = f"🔑 **Edit Discord Token**\n\n"
-    message += f"Instance: `{short_id}...`\n"
-    message += f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
-    message += f"Please send the new Discord user token:"
+    message = (
+        "🔑 **Edit Discord Token**\n\n"
+        f"Instance: `{short_id}...`\n"
+        f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
+        "Please send the new Discord user token:"
+    )
 
-    context.user_data['editing_discord_token'] = True
-    context.user_data['edit_instance_index'] = instance_index
+    session.editing = 'discord_token'
+    session.edit_instance_index = instance_index
 
     await update.callback_query.edit_message_text(
         message,
@@ -1474,9 +1727,9 @@ async def start_edit_discord_token(update: Update, context: ContextTypes.DEFAULT
 
 async def start_edit_telegram_token(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Start editing Telegram token"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1484,17 +1737,19 @@ async def start_edit_telegram_token(update: Update, context: ContextTypes.DEFAUL
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
-    preserve_db = context.user_data.get('preserve_db', True)
+    short_id = instance['short_id']
+    session = get_session(context)
+    preserve_db = session.preserve_db
 
-    message = f"🤖 **Edit Telegram Bot Token**\n\n"
-    message += f"Instance: `{short_id}...`\n"
-    message += f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
-    message += f"Please send the new Telegram bot token:"
+    message = (
+        "🤖 **Edit Telegram Bot Token**\n\n"
+        f"Instance: `{short_id}...`\n"
+        f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
+        "Please send the new Telegram bot token:"
+    )
 
-    context.user_data['editing_telegram_token'] = True
-    context.user_data['edit_instance_index'] = instance_index
+    session.editing = 'telegram_token'
+    session.edit_instance_index = instance_index
 
     await update.callback_query.edit_message_text(
         message,
@@ -1503,9 +1758,9 @@ async def start_edit_telegram_token(update: Update, context: ContextTypes.DEFAUL
 
 async def start_edit_topics_channel(update: Update, context: ContextTypes.DEFAULT_TYPE, instance_index: int):
     """Start editing Topics channel ID"""
-    instances = instance_manager.list_instances()
+    instance = instance_manager.get_by_index(instance_index)
 
-    if instance_index < 0 or instance_index >= len(instances):
+    if instance is None:
         await update.callback_query.edit_message_text(
             "❌ **Invalid Instance**\n\n"
             "The selected instance no longer exists.",
@@ -1513,17 +1768,19 @@ async def start_edit_topics_channel(update: Update, context: ContextTypes.DEFAUL
         )
         return
 
-    instance = instances[instance_index]
-    short_id = instance['docker_stack_name'][:8]
-    preserve_db = context.user_data.get('preserve_db', True)
+    short_id = instance['short_id']
+    session = get_session(context)
+    preserve_db = session.preserve_db
 
-    message = f"📋 **Edit Topics Channel ID**\n\n"
-    message += f"Instance: `{short_id}...`\n"
-    message += f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
-    message += f"Please send the new Topics channel ID:"
+    message = (
+        "📋 **Edit Topics Channel ID**\n\n"
+        f"Instance: `{short_id}...`\n"
+        f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
+        "Please send the new Topics channel ID:"
+    )
 
-    context.user_data['editing_topics_channel'] = True
-    context.user_data['edit_instance_index'] = instance_index
+    session.editing = 'topics_channel'
+    session.edit_instance_index = instance_index
 
     await update.callback_query.edit_message_text(
         message,
@@ -1533,11 +1790,12 @@ async def start_edit_topics_channel(update: Update, context: ContextTypes.DEFAUL
 async def handle_edit_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle input for editing instance parameters"""
     # Check what's being edited
-    if context.user_data.get('editing_discord_token'):
+    editing = get_session(context).editing
+    if editing == 'discord_token':
         return await handle_discord_token_edit(update, context)
-    elif context.user_data.get('editing_telegram_token'):
+    elif editing == 'telegram_token':
         return await handle_telegram_token_edit(update, context)
-    elif context.user_data.get('editing_topics_channel'):
+    elif editing == 'topics_channel':
         return await handle_topics_channel_edit(update, context)
 
     # If not editing, pass to other handlers
@@ -1545,26 +1803,30 @@ async def handle_edit_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def handle_discord_token_edit(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Discord token edit"""
-    new_token = update.message.text.strip()
-    instance_index = context.user_data.get('edit_instance_index')
-    preserve_db = context.user_data.get('preserve_db', True)
-
-    instances = instance_manager.list_instances()
-    if instance_index is None or instance_index < 0 or instance_index >= len(instances):
-        await update.message.reply_text(
+    message = update.message
+    new_token = message.text.strip()
+    session = get_session(context)
+    instance_index = session.edit_instance_index
+    preserve_db = session.preserve_db
+
+    instance = instance_manager.get_by_index(instance_index)
+    if instance is None:
+        await message.reply_text(
             "❌ **Edit Failed**\n\n"
             "Instance no longer exists.",
             parse_mode=ParseMode.MARKDOWN
         )
-        context.user_data.clear()
+        end_session(context)
         return ConversationHandler.END
 
-    instance = instances[instance_index]
     stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
+    short_id = instance['short_id']
+
+    # Stop routing text here so a second message cannot start another edit while this one runs
+    session.editing = None
 
     # Show processing message
-    await update.message.reply_text(
+    await message.reply_text(
         f"⚙️ **Updating Discord Token**\n\n"
         f"Instance: `{short_id}...`\n"
         f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
@@ -1575,24 +1837,24 @@ async def handle_discord_token_edit(update: Update, context: ContextTypes.DEFAUL
     try:
         if preserve_db:
             # Stop container, edit .env, restart
-            success = instance_manager.edit_instance_preserve_db(stack_name, 'DISCORD_TOKEN', new_token)
+            success = await run_docker_job(instance_manager.edit_instance_preserve_db, stack_name, 'DISCORD_TOKEN', new_token)
         else:
             # Delete and recreate instance
-            success = instance_manager.recreate_instance(instance_index, discord_token=new_token)
+            success = await run_docker_job(instance_manager.recreate_instance, stack_name, discord_token=new_token)
 
         if success:
             # Update data.json
-            instances[instance_index]['discord_token'] = new_token
-            instance_manager.save_data()
+            instance['discord_token'] = new_token
+            mark_dirty()
 
-            await update.message.reply_text(
+            await message.reply_text(
                 f"✅ **Discord Token Updated**\n\n"
                 f"Instance `{short_id}...` has been updated successfully.\n\n"
                 f"Method: {'Preserve Database' if preserve_db else 'Recreate Instance'}",
                 parse_mode=ParseMode.MARKDOWN
             )
         else:
-            await update.message.reply_text(
+            await message.reply_text(
                 f"❌ **Failed to Update Discord Token**\n\n"
                 f"Could not update instance `{short_id}...`\n\n"
                 f"Please check the logs for more details.",
@@ -1600,38 +1862,42 @@ async def handle_discord_token_edit(update: Update, context: ContextTypes.DEFAUL
             )
 
     except Exception as e:
-        await update.message.reply_text(
+        await message.reply_text(
             f"❌ **Edit Failed**\n\n"
             f"Error: {str(e)}",
             parse_mode=ParseMode.MARKDOWN
         )
 
     # Clear edit state
-    context.user_data.clear()
+    end_session(context)
     return ConversationHandler.END
 
 async def handle_telegram_token_edit(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Telegram token edit"""
-    new_token = update.message.text.strip()
-    instance_index = context.user_data.get('edit_instance_index')
-    preserve_db = context.user_data.get('preserve_db', True)
-
-    instances = instance_manager.list_instances()
-    if instance_index is None or instance_index < 0 or instance_index >= len(instances):
-        await update.message.reply_text(
+    message = update.message
+    new_token = message.text.strip()
+    session = get_session(context)
+    instance_index = session.edit_instance_index
+    preserve_db = session.preserve_db
+
+    instance = instance_manager.get_by_index(instance_index)
+    if instance is None:
+        await message.reply_text(
             "❌ **Edit Failed**\n\n"
             "Instance no longer exists.",
             parse_mode=ParseMode.MARKDOWN
         )
-        context.user_data.clear()
+        end_session(context)
         return ConversationHandler.END
 
-    instance = instances[instance_index]
     stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
+    short_id = instance['short_id']
+
+    # Stop routing text here so a second message cannot start another edit while this one runs
+    session.editing = None
 
     # Show processing message
-    await update.message.reply_text(
+    await message.reply_text(
         f"⚙️ **Updating Telegram Bot Token**\n\n"
         f"Instance: `{short_id}...`\n"
         f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
@@ -1642,24 +1908,24 @@ async def handle_telegram_token_edit(update: Update, context: ContextTypes.DEFAU
     try:
         if preserve_db:
             # Stop container, edit .env, restart
-            success = instance_manager.edit_instance_preserve_db(stack_name, 'TELEGRAM_BOT_TOKEN', new_token)
+            success = await run_docker_job(instance_manager.edit_instance_preserve_db, stack_name, 'TELEGRAM_BOT_TOKEN', new_token)
         else:
             # Delete and recreate instance
-            success = instance_manager.recreate_instance(instance_index, telegram_token=new_token)
+            success = await run_docker_job(instance_manager.recreate_instance, stack_name, telegram_token=new_token)
 
         if success:
             # Update data.json
-            instances[instance_index]['telegram_token'] = new_token
-            instance_manager.save_data()
+            instance['telegram_token'] = new_token
+            mark_dirty()
 
-            await update.message.reply_text(
+            await message.reply_text(
                 f"✅ **Telegram Bot Token Updated**\n\n"
                 f"Instance `{short_id}...` has been updated successfully.\n\n"
                 f"Method: {'Preserve Database' if preserve_db else 'Recreate Instance'}",
                 parse_mode=ParseMode.MARKDOWN
             )
         else:
-            await update.message.reply_text(
+            await message.reply_text(
                 f"❌ **Failed to Update Telegram Bot Token**\n\n"
                 f"Could not update instance `{short_id}...`\n\n"
                 f"Please check the logs for more details.",
@@ -1667,49 +1933,51 @@ async def handle_telegram_token_edit(update: Update, context: ContextTypes.DEFAU
             )
 
     except Exception as e:
-        await update.message.reply_text(
+        await message.reply_text(
             f"❌ **Edit Failed**\n\n"
             f"Error: {str(e)}",
             parse_mode=ParseMode.MARKDOWN
         )
 
     # Clear edit state
-    context.user_data.clear()
+    end_session(context)
     return ConversationHandler.END
 
 async def handle_topics_channel_edit(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Topics channel edit"""
-    new_channel_id = update.message.text.strip()
-    instance_index = context.user_data.get('edit_instance_index')
-    preserve_db = context.user_data.get('preserve_db', True)
+    message = update.message
+    new_channel_id = message.text.strip()
+    session = get_session(context)
+    instance_index = session.edit_instance_index
+    preserve_db = session.preserve_db
 
     # Validate channel ID
-    try:
-        int(new_channel_id)
-    except ValueError:
-        await update.message.reply_text(
+    if not is_valid_channel_id(new_channel_id):
+        await message.reply_text(
             "❌ **Invalid Channel ID**\n\n"
             "Please send a valid Topics channel ID (numbers only):",
             parse_mode=ParseMode.MARKDOWN
         )
         return
 
-    instances = instance_manager.list_instances()
-    if instance_index is None or instance_index < 0 or instance_index >= len(instances):
-        await update.message.reply_text(
+    instance = instance_manager.get_by_index(instance_index)
+    if instance is None:
+        await message.reply_text(
             "❌ **Edit Failed**\n\n"
             "Instance no longer exists.",
             parse_mode=ParseMode.MARKDOWN
         )
-        context.user_data.clear()
+        end_session(context)
         return ConversationHandler.END
 
-    instance = instances[instance_index]
     stack_name = instance['docker_stack_name']
-    short_id = stack_name[:8]
+    short_id = instance['short_id']
+
+    # Stop routing text here so a second message cannot start another edit while this one runs
+    session.editing = None
 
     # Show processing message
-    await update.message.reply_text(
+    await message.reply_text(
         f"⚙️ **Updating Topics Channel ID**\n\n"
         f"Instance: `{short_id}...`\n"
         f"Preserve Database: {'✅ Yes' if preserve_db else '❌ No'}\n\n"
@@ -1720,17 +1988,17 @@ async def handle_topics_channel_edit(update: Update, context: ContextTypes.DEFAU
     try:
         if preserve_db:
             # Stop container, edit .env, restart
-            success = instance_manager.edit_instance_preserve_db(stack_name, 'TOPICS_CHANNEL_ID', new_channel_id)
+            success = await run_docker_job(instance_manager.edit_instance_preserve_db, stack_name, 'TOPICS_CHANNEL_ID', new_channel_id)
         else:
             # Delete and recreate instance
-            success = instance_manager.recreate_instance(instance_index, topics_channel_id=new_channel_id)
+            success = await run_docker_job(instance_manager.recreate_instance, stack_name, topics_channel_id=new_channel_id)
 
         if success:
             # Update data.json
-            instances[instance_index]['topics_channel_id'] = new_channel_id
-            instance_manager.save_data()
+            instance['topics_channel_id'] = new_channel_id
+            mark_dirty()
 
-            await update.message.reply_text(
+            await message.reply_text(
                 f"✅ **Topics Channel ID Updated**\n\n"
                 f"Instance `{short_id}...` has been updated successfully.\n\n"
                 f"New Channel ID: `{new_channel_id}`\n"
@@ -1738,7 +2006,7 @@ async def handle_topics_channel_edit(update: Update, context: ContextTypes.DEFAU
                 parse_mode=ParseMode.MARKDOWN
             )
         else:
-            await update.message.reply_text(
+            await message.reply_text(
                 f"❌ **Failed to Update Topics Channel ID**\n\n"
                 f"Could not update instance `{short_id}...`\n\n"
                 f"Please check the logs for more details.",
@@ -1746,59 +2014,32 @@ async def handle_topics_channel_edit(update: Update, context: ContextTypes.DEFAU
             )
 
     except Exception as e:
-        await update.message.reply_text(
+        await message.reply_text(
             f"❌ **Edit Failed**\n\n"
             f"Error: {str(e)}",
             parse_mode=ParseMode.MARKDOWN
         )
 
     # Clear edit state
-    context.user_data.clear()
+    end_session(context)
     return ConversationHandler.END
 
 async def help_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show help information"""
-    help_text = """
-ℹ️ **TGCrossChat Manager Help**
-
-**Commands:**
-• `/start` - Show main menu
-• `/status` - Quick status overview
-
-**Features:**
-• **Create Instance** - Set up a new TGCrossChat bridge
-• **List Instances** - View all active instances
-• **Stop Instance** - Remove an instance and clean up
-
-**Instance Creation Process:**
-1. Provide Discord user token (selfbot)
-2. Provide Telegram bot token
-3. Provide Telegram topics channel ID
-4. System automatically creates and starts instance
-
-**Notes:**
-• Each chat can only have one active instance
-• Instances are isolated using Docker containers
-• All data is cleaned up when stopping instances
-• Use Discord user tokens, not bot tokens
-    """
-
-    keyboard = [[InlineKeyboardButton("🔙 Back to Menu", callback_data="back_to_menu")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
     await update.callback_query.edit_message_text(
-        help_text.strip(),
-        reply_markup=reply_markup,
+        HELP_TEXT,
+        reply_markup=BACK_TO_MENU_MARKUP,
         parse_mode=ParseMode.MARKDOWN
     )
 
 async def handle_discord_token(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Discord token input"""
-    if not context.user_data.get('creating_instance'):
+    session = get_session(context)
+    if not session.creating_instance:
         return ConversationHandler.END
 
     discord_token = update.message.text.strip()
-    context.user_data['discord_token'] = discord_token
+    session.discord_token = discord_token
 
     await update.message.reply_text(
         "🤖 **Step 2/3**\n\n"
@@ -1812,11 +2053,12 @@ async def handle_discord_token(update: Update, context: ContextTypes.DEFAULT_TYP
 
 async def handle_telegram_token(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Telegram token input"""
-    if not context.user_data.get('creating_instance'):
+    session = get_session(context)
+    if not session.creating_instance:
         return ConversationHandler.END
 
     telegram_token = update.message.text.strip()
-    context.user_data['telegram_token'] = telegram_token
+    session.telegram_token = telegram_token
 
     await update.message.reply_text(
         "📋 **Step 3/3**\n\n"
@@ -1828,41 +2070,56 @@ async def handle_telegram_token(update: Update, context: ContextTypes.DEFAULT_TY
 
     return WAITING_TOPICS_CHANNEL
 
-async def handle_topics_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle topics channel ID and create instance"""
-    if not context.user_data.get('creating_instance'):
-        return ConversationHandler.END
-
-    topics_channel_id = update.message.text.strip()
-
-    # Validate channel ID format
-    try:
-        int(topics_channel_id)
-    except ValueError:
-        await update.message.reply_text(
-            "❌ Invalid channel ID format. Please provide a valid numeric channel ID."
-        )
-        return WAITING_TOPICS_CHANNEL
-
-    # Create instance
-    creating_message = await update.message.reply_text(
+# Progress lines shown while an instance is being created
+CREATE_PHASE_TEXT = {
+    "queued": "🕒 Queued behind other Docker operations...",
+    "cloning": "🔄 Cloning repository...",
+    "configuring": "📝 Writing configuration...",
+    "starting": "🐳 Starting Docker containers...",
+}
+
+def creating_instance_text(phase: str) -> str:
+    """Progress message for an instance creation stage"""
+    return (
         "⏳ **Creating Instance...**\n\n"
         "This may take a few minutes. Please wait...\n\n"
-        "🔄 Cloning repository...",
-        parse_mode=ParseMode.MARKDOWN
+        f"{CREATE_PHASE_TEXT[phase]}"
     )
 
+async def creation_ticker(message, docker_stack_name: str, shown: str, interval: float = 2.0):
+    """Keep the creation message in sync with the current stage"""
+    while True:
+        await asyncio.sleep(interval)
+        phase = instance_manager.get_create_phase(docker_stack_name) or "queued"
+        if phase == shown:
+            continue
+        try:
+            await message.edit_text(creating_instance_text(phase), parse_mode=ParseMode.MARKDOWN)
+            shown = phase
+        except Exception as e:
+            logger.debug(f"Failed to update creation progress: {e}")
+
+async def run_instance_creation(context: ContextTypes.DEFAULT_TYPE, message, chat_id: str, discord_token: str, telegram_token: str, topics_channel_id: str, shown: str):
+    """Create an instance in the background and report the result"""
+    stack_name = instance_manager.generate_instance_hash(chat_id, discord_token, telegram_token)
+    ticker = asyncio.create_task(creation_ticker(message, stack_name, shown))
+
     try:
-        instance_data = instance_manager.create_instance(
-            chat_id=context.user_data['chat_id'],
-            discord_token=context.user_data['discord_token'],
-            telegram_token=context.user_data['telegram_token'],
-            topics_channel_id=topics_channel_id
-        )
+        try:
+            instance_data = await run_docker_job(
+                instance_manager.create_instance,
+                chat_id=chat_id,
+                discord_token=discord_token,
+                telegram_token=telegram_token,
+                topics_channel_id=topics_channel_id
+            )
+        finally:
+            # Stop before the final edit so the ticker cannot overwrite it, and never leak it
+            ticker.cancel()
 
-        await creating_message.edit_text(
+        await message.edit_text(
             "✅ **Instance Created Successfully!**\n\n"
-            f"Instance ID: `{instance_data['docker_stack_name'][:8]}...`\n"
+            f"Instance ID: `{instance_data['short_id']}...`\n"
             f"Chat ID: `{instance_data['chatid']}`\n"
             f"Topics Channel: `{instance_data['topics_channel_id']}`\n\n"
             "🚀 Your TGCrossChat bridge is now running!\n"
@@ -1871,55 +2128,96 @@ async def handle_topics_channel(update: Update, context: ContextTypes.DEFAULT_TY
         )
 
     except Exception as e:
-        logger.error(f"Failed to create instance: {e}")
-        await creating_message.edit_text(
+        logger.exception("Failed to create instance: %s", e)
+        await message.edit_text(
             f"❌ **Instance Creation Failed**\n\n"
             f"Error: {str(e)}\n\n"
             f"Please check your tokens and try again.",
             parse_mode=ParseMode.MARKDOWN
         )
 
+    finally:
+        context.user_data.pop('create_inflight', None)
+
+async def handle_topics_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle topics channel ID and create instance"""
+    session = get_session(context)
+    if not session.creating_instance:
+        return ConversationHandler.END
+
+    message = update.message
+    user_data = context.user_data
+    topics_channel_id = message.text.strip()
+
+    # Validate channel ID format
+    if not is_valid_channel_id(topics_channel_id):
+        await message.reply_text(
+            "❌ Invalid channel ID format. Please provide a valid numeric channel ID."
+        )
+        return WAITING_TOPICS_CHANNEL
+
+    if user_data.get('create_inflight'):
+        await message.reply_text(
+            "⏳ An instance is already being created. Please wait for it to finish."
+        )
+        return ConversationHandler.END
+
+    # Create instance in the background so the handler returns right away
+    shown = "queued" if DOCKER_SEMAPHORE.locked() else "cloning"
+    creating_message = await message.reply_text(
+        creating_instance_text(shown),
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+    user_data['create_inflight'] = True
+    context.application.create_task(
+        run_instance_creation(
+            context,
+            creating_message,
+            chat_id=session.chat_id,
+            discord_token=session.discord_token,
+            telegram_token=session.telegram_token,
+            topics_channel_id=topics_channel_id,
+            shown=shown
+        ),
+        update=update
+    )
+
     # Clean up user data
-    context.user_data.clear()
+    end_session(context)
     return ConversationHandler.END
 
 async def cancel_creation(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Cancel instance creation"""
-    context.user_data.clear()
+    end_session(context)
     await update.message.reply_text("❌ Instance creation cancelled.")
     return ConversationHandler.END
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show quick status overview"""
-    if not await is_authorized_chat(update):
-        return
-
     instances = instance_manager.list_instances()
 
-    message = f"📊 **TGCrossChat Manager Status**\n\n"
-    message += f"🔧 Active Instances: **{len(instances)}**\n"
-
+    instance_list = ""
     if instances:
-        message += f"\n📋 **Instance List:**\n"
-        for instance in instances:
-            short_id = instance['docker_stack_name'][:8]
-            message += f"• `{short_id}...` (Chat: {instance['chatid']})\n"
+        instance_list = "\n📋 **Instance List:**\n" + "".join(
+            f"• `{instance['short_id']}...` (Chat: {instance['chatid']})\n" for instance in instances
+        )
 
-    message += f"\n💡 Use /start for full management interface."
+    message = (
+        f"📊 **TGCrossChat Manager Status**\n\n"
+        f"🔧 Active Instances: **{len(instances)}**\n"
+        f"{instance_list}"
+        "\n💡 Use /start for full management interface."
+    )
 
     await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
 
 async def id_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show chat ID - works in any chat"""
-    chat_id = update.effective_chat.id
-    chat_type = update.effective_chat.type
+    chat = update.effective_chat
+    title_line = f"\nChat Title: `{chat.title}`" if chat.title else ""
 
-    message = f"🆔 **Chat Information**\n\n"
-    message += f"Chat ID: `{chat_id}`\n"
-    message += f"Chat Type: `{chat_type}`"
-
-    if update.effective_chat.title:
-        message += f"\nChat Title: `{update.effective_chat.title}`"
+    message = f"🆔 **Chat Information**\n\nChat ID: `{chat.id}`\nChat Type: `{chat.type}`{title_line}"
 
     await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
 
@@ -2321,23 +2619,53 @@ async def cancel_token_extraction_callback(update: Update, context: ContextTypes
 
 async def back_to_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Return to main menu"""
-    keyboard = [
-        [InlineKeyboardButton("📋 List Instances", callback_data="list_instances")],
-        [InlineKeyboardButton("➕ Create Instance", callback_data="create_instance")],
-        [InlineKeyboardButton("⚙️ Manage Instances", callback_data="stop_instance")],
-        [InlineKeyboardButton("🔑 Get Token", callback_data="get_token")],
-        [InlineKeyboardButton("ℹ️ Help", callback_data="help")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
     await update.callback_query.edit_message_text(
-        "🤖 **TGCrossChat Manager**\n\n"
-        "Welcome to the TGCrossChat instance manager!\n"
-        "Use the buttons below to manage your instances.",
-        reply_markup=reply_markup,
+        MAIN_MENU_TEXT,
+        reply_markup=MAIN_MENU_MARKUP,
         parse_mode=ParseMode.MARKDOWN
     )
 
+# Callback data dispatch tables used by button_callback
+CALLBACK_HANDLERS = {
+    "list_instances": list_instances_callback,
+    "create_instance": create_instance_callback,
+    "stop_instance": stop_instance_callback,
+    "get_token": get_token_callback,
+    "start_token_extraction": start_token_extraction_callback,
+    "qr_scanned": qr_scanned_callback,
+    "rescreenshot_qr": rescreenshot_qr_callback,
+    "cancel_token_extraction": cancel_token_extraction_callback,
+    "back_to_menu": back_to_menu_callback,
+    "help": help_callback,
+}
+
+INSTANCE_CALLBACK_HANDLERS = {
+    "manage": manage_instance_callback,
+    "pause": partial(run_instance_action, action="pause"),
+    "resume": partial(run_instance_action, action="resume"),
+    "edit_discord_token": edit_discord_token_callback,
+    "edit_telegram_token": edit_telegram_token_callback,
+    "edit_topics_channel": edit_topics_channel_callback,
+    "preserve_db": toggle_preserve_db,
+    "start_edit_discord": start_edit_discord_token,
+    "start_edit_telegram": start_edit_telegram_token,
+    "start_edit_topics": start_edit_topics_channel,
+    "edit": edit_instance_callback,
+    "update": update_instance_action,
+    "recreate": recreate_instance_action,
+    "delete": delete_instance_action,
+    "confirm_delete": partial(run_instance_action, action="delete"),
+    "details": show_instance_details,
+}
+
+async def post_init(application: Application):
+    """Start background tasks once the event loop is running"""
+    persister.start()
+
+async def post_stop(application: Application):
+    """Flush pending data before shutdown"""
+    await persister.stop()
+
 def main():
     """Main function to run the manager bot"""
     if not config.telegram_bot_token or config.telegram_bot_token == "your_manager_bot_token_here":
@@ -2348,12 +2676,25 @@ def main():
         logger.error("Please configure telegram_username in config.py")
         return
 
+    # HTTP/2 multiplexes concurrent Bot API calls over one pooled connection;
+    # long polling gets its own request object so it never starves the pool
+    request = HTTPXRequest(http_version="2", connection_pool_size=64, connect_timeout=5, read_timeout=20)
+    get_updates_request = HTTPXRequest(http_version="2", connect_timeout=5, read_timeout=20)
+
     # Create application
-    application = Application.builder().token(config.telegram_bot_token).build()
+    application = (
+        Application.builder()
+        .token(config.telegram_bot_token)
+        .request(request)
+        .get_updates_request(get_updates_request)
+        .post_init(post_init)
+        .post_stop(post_stop)
+        .build()
+    )
 
     # Create conversation handler for instance creation
     conversation_handler = ConversationHandler(
-        entry_points=[CallbackQueryHandler(create_instance_callback, pattern="^create_instance$")],
+        entry_points=[CallbackQueryHandler(create_instance_callback, pattern=is_create_instance_data)],
         states={
             WAITING_DISCORD_TOKEN: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_discord_token)],
             WAITING_TELEGRAM_TOKEN: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_telegram_token)],
@@ -2364,13 +2705,14 @@ def main():
     )
 
     # Add handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("status", status_command))
+    application.add_handler(CommandHandler("start", start_command, filters=AUTHORIZED_USER))
+    application.add_handler(CommandHandler("status", status_command, filters=AUTHORIZED_USER))
     application.add_handler(CommandHandler("id", id_command))
     application.add_handler(conversation_handler)
-    application.add_handler(CallbackQueryHandler(button_callback))
+    # Non-blocking: a docker operation started from one button must not hold up other updates
+    application.add_handler(CallbackQueryHandler(button_callback, block=False))
     # Add message handler for edit inputs (lower priority)
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_edit_input))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_edit_input, block=False))
 
     logger.info("TGCrossChat Manager Bot starting...")
     logger.info(f"Authorized username: @{config.telegram_username}")
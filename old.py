@@ -1,5 +1,8 @@
+import asyncio
 import logging
-import requests
+import re
+import time
+import aiohttp
 import discord
 
 import threading
@@ -13,6 +16,20 @@ from telegram.ext import (
     filters,
 )
 
+# orjson is optional; it only speeds up encoding webhook payloads
+try:
+    import orjson
+
+    def dumpJson(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def dumpJson(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 # Enable logging
 logging.basicConfig(
@@ -26,20 +43,20 @@ logger = logging.getLogger(__name__)
 webhook = "https://discord.com/api/webhooks/"
 
 application: Application = Application
+# Shared keep-alive HTTP session for webhook calls, opened once the event loop runs
+session: aiohttp.ClientSession = None
 bot = discord.Client(intents=discord.Intents.all())
 channelToWebhook = {
     1: "1"
 }
 
-webhookIds = [int(i.split("/")[0]) for i in channelToWebhook.values()]
+webhookIds = frozenset(int(i.split("/")[0]) for i in channelToWebhook.values())
 
 tgToDc = {
     -1: 1
 }
-dcToTg = {}
-
-for k, v in tgToDc.items():
-    dcToTg[v] = k
+# Reverse map doubles as the O(1) set of bridged Discord channels
+dcToTg = {v: k for k, v in tgToDc.items()}
 
 
 replace = {
@@ -54,62 +71,68 @@ replace = {
 
 separators = list(" ?.!,")
 
-def sumOfList(x):
-    out = []
-    for i in x:
-        out += i
-    return out
-
-def separate(text,separators):
-    out = [text]
-    for separator in separators:
-        tmp = []
-        for i in out:
-            tmp2=[]
-            x = i.split(separator)
-            for y in x:
-                tmp2.append(y)
-                tmp2.append(separator)
-            tmp2.pop()
-            tmp.append(tmp2)
-        out = sumOfList(tmp)
-    return out
-
-def allInclude(txt, include):
-    for i in txt:
-        if not i in include:
-            return False
-    return True
+_LOWER = frozenset("abcdefghijklmnopqrstuvwxyz")
+_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# Shorthand is only expanded as a whole token, i.e. bounded by separators or the
+# ends of the text, so an escaped \u is kept until removeSlash strips the backslash
+_NOT_SEP = "[^" + re.escape("".join(separators)) + "]"
+_REPLACE_RE = re.compile(
+    "(?<!" + _NOT_SEP + ")("
+    + "|".join(map(re.escape, sorted(replace, key=len, reverse=True)))
+    + ")(?!" + _NOT_SEP + ")",
+    re.IGNORECASE,
+)
+_SLASH_RE = re.compile("(?<!" + _NOT_SEP + ")\\\\")
 
 def formatStr(string,toFormat):
-    lower = "abcdefghijklmnopqrstuvwxyz"
-    upper = lower.upper()
-    if string[0] in upper and allInclude(string[1:],lower):
+    if string[0] in _UPPER and _LOWER.issuperset(string[1:]):
         return toFormat.title()
-    if allInclude(string,upper):
+    if _UPPER.issuperset(string):
         return toFormat.upper()
     return toFormat
 
-
-def splitReplace(separators,replaceFrom,replaceTo,text):
-    out = []
-    text = separate(text, separators)
-    for i in text:
-        if i.lower() == replaceFrom:
-            out.append(formatStr(i,replaceTo))
-        else:
-            out.append(i)
-    return "".join(out)
-
 def removeSlash(text):
-    out = []
-    text = separate(text, separators)
-    for i in text:
-        if i.startswith("\\"):
-            out.append(i[1:])
-        else:
-            out.append(i)
-    return "".join(out)
+    return _SLASH_RE.sub("", text)
+
+def _replaceMatch(match):
+    word = match.group(0)
+    return formatStr(word, replace[word.lower()])
+
+def expandShorthand(text):
+    text = text.replace("‘", "'").replace("’", "'")
+    text = _REPLACE_RE.sub(_replaceMatch, text)
+    return removeSlash(text)
+
+defaultAvatar = "https://discord.com/assets/411d8a698dd15ddf.png"
+# Telegram user id -> (expiry time, avatar url); file links stay valid for about an hour
+avatarCache = {}
+avatarTtl = 600
+avatarCacheSize = 1024
+
+async def getAvatar(tgbot: Bot, userId: int) -> str:
+    now = time.monotonic()
+    cached = avatarCache.get(userId)
+    if cached and cached[0] > now:
+        return cached[1]
+    try:
+        avatar_url = (
+            await (
+                await tgbot.get_user_profile_photos(userId, limit=1)
+            )
+            .photos[0][0]
+            .get_file()
+        ).file_path
+    except Exception as e:
+        # Users without a photo get the fallback cached too, so they aren't retried every message
+        print(f"Failed to get avatar: {e}")
+        avatar_url = defaultAvatar
+    avatarCache.pop(userId, None)
+    if len(avatarCache) >= avatarCacheSize:
+        avatarCache.pop(next(iter(avatarCache)))
+    avatarCache[userId] = (now + avatarTtl, avatar_url)
+    return avatar_url
+
 
 @bot.event
 async def on_ready():
@@ -119,25 +142,30 @@ async def on_ready():
 
 @bot.event
 async def on_message(message: discord.Message):
-    tgbot: Bot = application.bot
-    if message.author == bot.user:
+    author = message.author
+    if author == bot.user:
         return
     if message.webhook_id in webhookIds:
         return
-    if message.channel.id in tgToDc.values():
+    tgChatId = dcToTg.get(message.channel.id)
+    if tgChatId is not None:
+        tgbot: Bot = application.bot
+        header = f"{author.display_name}(@{author.name}):\n"
         if message.reference:
             reference = await message.channel.fetch_message(message.reference.message_id)
-            replyingTo = f"replying to {reference.author.display_name}(@{reference.author.name}): \"{reference.content[:50]}\":\n"
+            refAuthor = reference.author
+            refContent = reference.content[:50]
+            replyingTo = f"replying to {refAuthor.display_name}(@{refAuthor.name}): \"{refContent}\":\n"
             if reference.webhook_id:
-                replyingTo = f"replying to {reference.author.display_name}: \"{reference.content[:50]}\":\n"
+                replyingTo = f"replying to {refAuthor.display_name}: \"{refContent}\":\n"
             msg = await tgbot.send_message(
-                chat_id=dcToTg[message.channel.id],
-                text=f"{message.author.display_name}(@{message.author.name}):\n{replyingTo}{message.content}"
+                chat_id=tgChatId,
+                text=f"{header}{replyingTo}{message.content}"
             )
         else:
             msg = await tgbot.send_message(
-                chat_id=dcToTg[message.channel.id],
-                text=f"{message.author.display_name}(@{message.author.name}):\n{message.content}"
+                chat_id=tgChatId,
+                text=f"{header}{message.content}"
             )
         for attachment in message.attachments:
             print(attachment)
@@ -177,146 +205,126 @@ async def updateData(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     await update.message.reply_text(update.effective_chat.id)
 
 
-async def echo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if update.effective_chat.id in tgToDc.keys():
+# webhook url -> pending payloads, drained in order by one worker per webhook
+webhookQueues = {}
+webhookWorkers = {}
+webhookBatchSize = 10
+discordMessageLimit = 2000
+
+async def sendWebhook(url: str, data: dict) -> None:
+    queue = webhookQueues.get(url)
+    if queue is None:
+        queue = webhookQueues[url] = asyncio.Queue()
+        webhookWorkers[url] = asyncio.create_task(webhookWorker(url, queue))
+    await queue.put(data)
+
+def mergeBatch(batch):
+    # Back-to-back messages from the same sender become one webhook call
+    merged = [batch[0]]
+    for data in batch[1:]:
+        last = merged[-1]
+        if (
+            data["username"] == last["username"]
+            and data["avatar_url"] == last["avatar_url"]
+            and len(last["content"]) + 1 + len(data["content"]) <= discordMessageLimit
+        ):
+            merged[-1] = {**last, "content": last["content"] + "\n" + data["content"]}
+        else:
+            merged.append(data)
+    return merged
+
+async def webhookWorker(url: str, queue: asyncio.Queue) -> None:
+    while True:
+        batch = [await queue.get()]
+        # Take whatever queued up while the previous request was in flight; never wait for more
+        while len(batch) < webhookBatchSize and not queue.empty():
+            batch.append(queue.get_nowait())
+        for data in mergeBatch(batch):
+            try:
+                async with session.post(url, data=dumpJson(data), headers=JSON_HEADERS) as response:
+                    if response.status != 204 and response.status != 200:
+                        print(f"Failed to send message: {response.status}")
+            except Exception as e:
+                print(f"Failed to send message: {e}")
+
+async def _forward(update: Update, *, isReply: bool, isPhoto: bool) -> None:
+    chatId = update.effective_chat.id
+    user = update.effective_user
+    message = update.message
+    username = user.username
+
+    avatar_url = await getAvatar(update.get_bot(), user.id)
+    messageContent = message.text or ""
+    if username == "kobosh_com":
+        messageContent = expandShorthand(messageContent)
+    if isPhoto:
+        messageContent += "\n" + (await message.photo[-1].get_file()).file_path
+    if isReply:
+        repliedTo = message.reply_to_message
+        repliedUser = repliedTo.from_user
+        repliedText = repliedTo.text
+        if repliedUser.username == "kobosh_bot":
+            # Our own relayed text looks like "name: text"; keep the name and quote the text
+            name, _, text = repliedText.partition(': ')
+            replyingTo = f"replying to {name.rpartition('replying to ')[2]}: \"{text[:50]}\""
+        else:
+            replyingTo = f"replying to {repliedUser.full_name}(@{repliedUser.username}): \"{repliedText[:50]}\""
+        messageContent = f"{replyingTo}: \n{messageContent}"
+    # Send the message to the Discord channel
+    data = {
+        "content": messageContent,
+        "username": f"{user.full_name}(@{username})",
+        "avatar_url": avatar_url,
+    }
+    await sendWebhook(webhook + channelToWebhook[tgToDc[chatId]], data)
+
+# telegram chat id -> updates waiting to be forwarded, handled in order by one worker per chat
+chatQueues = {}
+chatWorkers = {}
+
+async def chatWorker(queue: asyncio.Queue) -> None:
+    while True:
+        update, isReply, isPhoto = await queue.get()
         try:
-            avatar_url = (
-                await (
-                    await update.get_bot().get_user_profile_photos(
-                        update.effective_user.id, limit=1
-                    )
-                )
-                .photos[0][0]
-                .get_file()
-            ).file_path
+            await _forward(update, isReply=isReply, isPhoto=isPhoto)
         except Exception as e:
-            print(f"Failed to get avatar: {e}")
-            avatar_url = "https://discord.com/assets/411d8a698dd15ddf.png"
-        print(update.message.document)
-        messageContent = update.message.text
-        if update.effective_user.username == "kobosh_com":
-            messageContent = messageContent.replace("‘", "'").replace("’", "'")
-            for k,v in replace.items():
-                messageContent = splitReplace(separators, k, v, messageContent)
-            messageContent = removeSlash(messageContent)
-        # Send the message to the Discord channel
-        data = {
-            "content": messageContent,
-            "username": f"{update.effective_user.full_name}(@{update.effective_user.username})",
-            "avatar_url": avatar_url,
-        }
-        response = requests.post(
-            webhook + channelToWebhook[tgToDc[update.effective_chat.id]], json=data
-        )
-        if response.status_code != 204 and response.status_code != 200:
-            print(f"Failed to send message: {response.status_code}")
+            print(f"Failed to forward message: {e}")
+
+def enqueueForward(update: Update, *, isReply: bool, isPhoto: bool) -> None:
+    # Return to the poll loop straight away so a slow chat never holds up the others
+    chatId = update.effective_chat.id
+    queue = chatQueues.get(chatId)
+    if queue is None:
+        queue = chatQueues[chatId] = asyncio.Queue()
+        chatWorkers[chatId] = asyncio.create_task(chatWorker(queue))
+    queue.put_nowait((update, isReply, isPhoto))
+
+async def echo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    enqueueForward(update, isReply=False, isPhoto=False)
 
 async def reply(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if update.effective_chat.id in tgToDc.keys():
-        try:
-            avatar_url = (
-                await (
-                    await update.get_bot().get_user_profile_photos(
-                        update.effective_user.id, limit=1
-                    )
-                )
-                .photos[0][0]
-                .get_file()
-            ).file_path
-        except Exception as e:
-            print(f"Failed to get avatar: {e}")
-            avatar_url = "https://discord.com/assets/411d8a698dd15ddf.png"
-        print(update.message.reply_to_message)
-        messageContent = update.message.text
-        if update.effective_user.username == "kobosh_com":
-            messageContent = messageContent.replace("‘", "'").replace("’", "'")
-            for k,v in replace.items():
-                messageContent = splitReplace(separators, k, v, messageContent)
-            messageContent = removeSlash(messageContent)
-        # Send the message to the Discord channel
-        replyingTo = f"replying to {update.message.reply_to_message.from_user.full_name}(@{update.message.reply_to_message.from_user.username}): \"{update.message.reply_to_message.text[:50]}\""
-        if update.message.reply_to_message.from_user.username == "kobosh_bot":
-            replyingTo = f"replying to {update.message.reply_to_message.text.split(': ')[0].split('replying to ')[-1]}: \"{''.join(update.message.reply_to_message.text.split(': ')[1:])[:50]}\""
-        data = {
-            "content": f"{replyingTo}: \n{messageContent}",
-            "username": f"{update.effective_user.full_name}(@{update.effective_user.username})",
-            "avatar_url": avatar_url,
-        }
-        response = requests.post(
-            webhook + channelToWebhook[tgToDc[update.effective_chat.id]], json=data
-        )
-        if response.status_code != 204 and response.status_code != 200:
-            print(f"Failed to send message: {response.status_code}")
+    enqueueForward(update, isReply=True, isPhoto=False)
 
 async def photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if update.effective_chat.id in tgToDc.keys():
-        try:
-            avatar_url = (
-                await (
-                    await update.get_bot().get_user_profile_photos(
-                        update.effective_user.id, limit=1
-                    )
-                )
-                .photos[0][0]
-                .get_file()
-            ).file_path
-        except Exception as e:
-            print(f"Failed to get avatar: {e}")
-            avatar_url = "https://discord.com/assets/411d8a698dd15ddf.png"
-        messageContent = (update.message.text or "")
-        if update.effective_user.username == "kobosh_com":
-            messageContent = messageContent.replace("‘", "'").replace("’", "'")
-            for k,v in replace.items():
-                messageContent = splitReplace(separators, k, v, messageContent)
-            messageContent = removeSlash(messageContent)
-        messageContent += "\n" + (await update.message.photo[-1].get_file()).file_path
-        # Send the message to the Discord channel
-        data = {
-            "content": messageContent,
-            "username": f"{update.effective_user.full_name}(@{update.effective_user.username})",
-            "avatar_url": avatar_url
-        }
-        response = requests.post(
-            webhook + channelToWebhook[tgToDc[update.effective_chat.id]], json=data
-        )
-        if response.status_code != 204 and response.status_code != 200:
-            print(f"Failed to send message: {response.status_code}")
+    enqueueForward(update, isReply=False, isPhoto=True)
 
 async def replyPhoto(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if update.effective_chat.id in tgToDc.keys():
-        try:
-            avatar_url = (
-                await (
-                    await update.get_bot().get_user_profile_photos(
-                        update.effective_user.id, limit=1
-                    )
-                )
-                .photos[0][0]
-                .get_file()
-            ).file_path
-        except Exception as e:
-            print(f"Failed to get avatar: {e}")
-            avatar_url = "https://discord.com/assets/411d8a698dd15ddf.png"
-        messageContent = (update.message.text or "")
-        if update.effective_user.username == "kobosh_com":
-            messageContent = messageContent.replace("‘", "'").replace("’", "'")
-            for k,v in replace.items():
-                messageContent = splitReplace(separators, k, v, messageContent)
-            messageContent = removeSlash(messageContent)
-        messageContent += "\n" + (await update.message.photo[-1].get_file()).file_path
-        replyingTo = f"replying to {update.message.reply_to_message.from_user.full_name}(@{update.message.reply_to_message.from_user.username}): \"{update.message.reply_to_message.text[:50]}\""
-        if update.message.reply_to_message.from_user.username == "kobosh_bot":
-            replyingTo = f"replying to {update.message.reply_to_message.text.split(': ')[0]}: \"{''.join(update.message.reply_to_message.text.split(': ')[1:])[:50]}\""
-        data = {
-            "content": f"{replyingTo}: \n{messageContent}",
-            "username": f"{update.effective_user.full_name}(@{update.effective_user.username})",
-            "avatar_url": avatar_url,
-        }
-        response = requests.post(
-            webhook + channelToWebhook[tgToDc[update.effective_chat.id]], json=data
-        )
-        if response.status_code != 204 and response.status_code != 200:
-            print(f"Failed to send message: {response.status_code}")
+    enqueueForward(update, isReply=True, isPhoto=True)
+
+
+async def openSession(application: Application) -> None:
+    global session
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+    )
+
+
+async def closeSession(application: Application) -> None:
+    for task in (*chatWorkers.values(), *webhookWorkers.values()):
+        task.cancel()
+    await session.close()
+
+
 def main() -> None:
     global application
     """Start the bot."""
@@ -324,6 +332,8 @@ def main() -> None:
     application = (
         Application.builder()
         .token("<TOKEN>")
+        .post_init(openSession)
+        .post_shutdown(closeSession)
         .build()
     )
 
@@ -331,11 +341,13 @@ def main() -> None:
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("data", updateData))
-    # on non command i.e message - echo the message on Telegram
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND & ~filters.PHOTO & ~filters.REPLY, echo))
-    application.add_handler(MessageHandler(filters.PHOTO & ~filters.COMMAND & ~filters.REPLY, photo))
-    application.add_handler(MessageHandler(filters.REPLY & ~filters.COMMAND & ~filters.PHOTO, reply))
-    application.add_handler(MessageHandler(filters.REPLY & filters.PHOTO & ~filters.COMMAND, replyPhoto))
+    # on non command i.e message - forward the message to Discord
+    # bridged chats are checked first so other chats are rejected before any other filter runs
+    bridgedChats = filters.Chat(chat_id=list(tgToDc))
+    application.add_handler(MessageHandler(bridgedChats & filters.TEXT & ~filters.COMMAND & ~filters.PHOTO & ~filters.REPLY, echo))
+    application.add_handler(MessageHandler(bridgedChats & filters.PHOTO & ~filters.COMMAND & ~filters.REPLY, photo))
+    application.add_handler(MessageHandler(bridgedChats & filters.REPLY & ~filters.COMMAND & ~filters.PHOTO, reply))
+    application.add_handler(MessageHandler(bridgedChats & filters.REPLY & filters.PHOTO & ~filters.COMMAND, replyPhoto))
     # Run the bot until the user presses Ctrl-C
     application.run_polling(allowed_updates=Update.ALL_TYPES)
 